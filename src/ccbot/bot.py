@@ -120,7 +120,7 @@ from .handlers.message_sender import (
 from .markdown_v2 import convert_markdown
 from .handlers.response_builder import build_response_parts
 from .handlers.status_polling import status_poll_loop
-from .screenshot import text_to_image
+from .screenshot import shutdown_render_pool, text_to_image
 from .session import session_manager
 from .session_monitor import NewMessage, SessionMonitor
 from .terminal_parser import extract_bash_output
@@ -1437,15 +1437,11 @@ async def handle_new_message(msg: NewMessage, bot: Bot) -> None:
             handled = await handle_interactive_ui(bot, user_id, wid, thread_id)
             if handled:
                 # Update user's read offset
-                session = await session_manager.resolve_session_for_window(wid)
-                if session and session.file_path:
-                    try:
-                        file_size = Path(session.file_path).stat().st_size
-                        session_manager.update_user_window_offset(
-                            user_id, wid, file_size
-                        )
-                    except OSError:
-                        pass
+                found = await session_manager.stat_session_file(wid)
+                if found:
+                    session_manager.update_user_window_offset(
+                        user_id, wid, found[1].st_size
+                    )
                 continue  # Don't send the normal tool_use message
             else:
                 # UI not rendered — clear the early-set mode
@@ -1480,13 +1476,11 @@ async def handle_new_message(msg: NewMessage, bot: Bot) -> None:
 
             # Update user's read offset to current file position
             # This marks these messages as "read" for this user
-            session = await session_manager.resolve_session_for_window(wid)
-            if session and session.file_path:
-                try:
-                    file_size = Path(session.file_path).stat().st_size
-                    session_manager.update_user_window_offset(user_id, wid, file_size)
-                except OSError:
-                    pass
+            found = await session_manager.stat_session_file(wid)
+            if found:
+                session_manager.update_user_window_offset(
+                    user_id, wid, found[1].st_size
+                )
 
 
 # --- App lifecycle ---
@@ -1561,6 +1555,9 @@ async def post_shutdown(application: Application) -> None:
         session_monitor.stop()
         logger.info("Session monitor stopped")
 
+    await session_manager.flush()
+    shutdown_render_pool()
+
 
 def create_bot() -> Application:
     application = (
@@ -69,6 +69,11 @@ class Config:
         # Claude Code session monitoring configuration
         self.claude_projects_path = Path.home() / ".claude" / "projects"
         self.monitor_poll_interval = float(os.getenv("MONITOR_POLL_INTERVAL", "2.0"))
+        # Full-history reads only load this many bytes from the end of the
+        # transcript (0 = whole file; older pages become unavailable otherwise)
+        self.recent_messages_tail_bytes = int(
+            os.getenv("RECENT_MESSAGES_TAIL_BYTES", "0")
+        )
 
         # Display user messages in history and real-time notifications
         # When True, user messages are shown with a 👤 prefix
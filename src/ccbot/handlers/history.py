@@ -128,7 +128,7 @@ async def send_history(
             pass
         else:
             # Filter to assistant messages only
-            messages = [m for m in messages if m["role"] == "assistant"]
+            messages = [m for m in messages if m.role == "assistant"]
         total = len(messages)
         if total == 0:
             if is_unread:
@@ -161,7 +161,7 @@ async def send_history(
         lines = [header]
         for msg in messages:
             # Format timestamp as HH:MM
-            ts = msg.get("timestamp")
+            ts = msg.timestamp
             if ts:
                 try:
                     # ISO format: 2024-01-15T14:32:00.000Z
@@ -179,9 +179,9 @@ async def send_history(
                 lines.append("─────────────")
 
             # Format message content
-            msg_text = msg["text"]
-            content_type = msg.get("content_type", "text")
-            msg_role = msg.get("role", "assistant")
+            msg_text = msg.text
+            content_type = msg.content_type
+            msg_role = msg.role
 
             # Strip expandable quote sentinels for history view
             msg_text = msg_text.replace(_start, "").replace(_end, "")
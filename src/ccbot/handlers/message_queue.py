@@ -221,7 +221,9 @@ async def _message_queue_worker(bot: Bot, user_id: int) -> None:
                         queue, task, lock
                     )
                     if merge_count > 0:
-                        logger.debug(f"Merged {merge_count} tasks for user {user_id}")
+                        logger.debug(
+                            "Merged %d tasks for user %d", merge_count, user_id
+                        )
                         # Mark merged tasks as done
                         for _ in range(merge_count):
                             queue.task_done()
@@ -242,7 +242,7 @@ def hook_main() -> None:
                 session_map: dict[str, dict[str, str]] = {}
                 if map_file.exists():
                     try:
-                        session_map = json.loads(map_file.read_text())
+                        session_map = json.loads(map_file.read_bytes())
                     except (json.JSONDecodeError, OSError):
                         logger.warning(
                             "Failed to read existing session_map, starting fresh"
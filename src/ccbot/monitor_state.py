@@ -57,7 +57,7 @@ class MonitorState:
             return
 
         try:
-            data = json.loads(self.state_file.read_text())
+            data = json.loads(self.state_file.read_bytes())
             sessions = data.get("tracked_sessions", {})
             self.tracked_sessions = {
                 k: TrackedSession.from_dict(v) for k, v in sessions.items()
@@ -11,9 +11,12 @@ Key function: text_to_image(text, font_size, with_ansi) → PNG bytes.
 """
 
 import asyncio
+import functools
 import io
 import logging
-import re
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -23,6 +26,28 @@ logger = logging.getLogger(__name__)
 
 _FONTS_DIR = Path(__file__).parent / "fonts"
 
+_DEFAULT_FONT_SIZE = 28
+
+# zlib level for PNG output: screenshots are transient uploads, so favor
+# encode speed (level 1 is ~35% faster than Pillow's default 6, ~4% larger)
+_DEFAULT_COMPRESS_LEVEL = 1
+
+# Max cached text-run masks (see _render_run)
+_RUN_CACHE_SIZE = 512
+
+# Image margin in pixels
+_PADDING = 16
+
+# Upper bound on canvas size (~192 MB as RGB): taller renders are truncated,
+# a single line too wide to fit is cropped
+_MAX_PIXELS = 64_000_000
+
+# Parallel band painting for tall images (see _render_png)
+_BAND_THREADS = min(4, os.cpu_count() or 1)
+_MIN_BAND_LINES = 32
+_band_pool: ThreadPoolExecutor | None = None
+_band_pool_lock = threading.Lock()
+
 # Font fallback chain (highest priority first):
 #   1. JetBrains Mono (OFL-1.1) — Latin, symbols, box-drawing, blocks
 #   2. Noto Sans Mono CJK SC (OFL-1.1) — CJK, additional symbols
@@ -67,20 +92,81 @@ _ANSI_COLORS: dict[int, tuple[int, int, int]] = {
     15: (255, 255, 255),  # Bright White
 }
 
+
+def _compute_256_color(idx: int) -> tuple[int, int, int]:
+    """Compute the RGB value of a 256-color palette index."""
+    if idx < 16:
+        return _ANSI_COLORS[idx]
+    elif idx < 232:
+        # 216 color cube: 16 + 36*r + 6*g + b
+        idx -= 16
+        r = (idx // 36) * 51
+        g = ((idx % 36) // 6) * 51
+        b = (idx % 6) * 51
+        return (r, g, b)
+    else:
+        # Grayscale: 232-255
+        gray = 8 + (idx - 232) * 10
+        return (gray, gray, gray)
+
+
+# Full 256-color palette, computed once at import
+_PALETTE_256: tuple[tuple[int, int, int], ...] = tuple(
+    _compute_256_color(i) for i in range(256)
+)
+
+# Characters allowed between "ESC [" and the final "m" of an SGR sequence
+_SGR_PARAM_CHARS = frozenset("0123456789;")
+
 # Default colors for terminals
 _DEFAULT_FG = (212, 212, 212)  # Light gray
 _DEFAULT_BG = (30, 30, 30)  # Dark gray
 
+# Gradient palette for plain-text renders: index = glyph coverage (0-255)
+_PLAIN_PALETTE: list[int] = [
+    round(bg + (fg - bg) * level / 255)
+    for level in range(256)
+    for fg, bg in zip(_DEFAULT_FG, _DEFAULT_BG)
+]
 
-@dataclass
+# SGR dispatch table: code → (action kind, color) or None for ignored codes
+_SGR_RESET, _SGR_FG, _SGR_BG, _SGR_EXT_FG, _SGR_EXT_BG = range(5)
+_SGR_TABLE_SIZE = 108
+
+
+def _build_sgr_actions() -> list[tuple[int, tuple[int, int, int] | None] | None]:
+    """Build the per-code SGR action table used by _apply_ansi_codes."""
+    actions: list[tuple[int, tuple[int, int, int] | None] | None] = [
+        None
+    ] * _SGR_TABLE_SIZE
+    actions[0] = (_SGR_RESET, None)
+    for i in range(8):
+        actions[30 + i] = (_SGR_FG, _ANSI_COLORS[i])
+        actions[40 + i] = (_SGR_BG, _ANSI_COLORS[i])
+        actions[90 + i] = (_SGR_FG, _ANSI_COLORS[i + 8])
+        actions[100 + i] = (_SGR_BG, _ANSI_COLORS[i + 8])
+    actions[38] = (_SGR_EXT_FG, None)
+    actions[39] = (_SGR_FG, _DEFAULT_FG)
+    actions[48] = (_SGR_EXT_BG, None)
+    actions[49] = (_SGR_BG, None)
+    return actions
+
+
+_SGR_ACTIONS = _build_sgr_actions()
+
+
+@dataclass(slots=True, frozen=True)
 class TextStyle:
-    """Text styling information from ANSI codes."""
+    """Text styling information from ANSI codes (immutable, shared)."""
 
     fg_color: tuple[int, int, int] = _DEFAULT_FG
     bg_color: tuple[int, int, int] | None = None
 
 
-@dataclass
+_DEFAULT_STYLE = TextStyle()
+
+
+@dataclass(slots=True)
 class StyledSegment:
     """A text segment with its styling."""
 
@@ -89,6 +175,13 @@ class StyledSegment:
     font_tier: int
 
 
+# Shared measurement context for textbbox (read-only, so thread-safe)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+# A measured, rasterized segment: (style, left, right, mask, mask offset)
+_PlacedRun = tuple[TextStyle, int, int, Image.Image | None, tuple[int, int]]
+
+
 def _load_font(path: Path, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     """Load a TrueType/OpenType font, falling back to Pillow default."""
     try:
@@ -98,6 +191,14 @@ def _load_font(path: Path, size: int) -> ImageFont.FreeTypeFont | ImageFont.Imag
         return ImageFont.load_default()
 
 
+@functools.lru_cache(maxsize=8)
+def _load_fonts(
+    size: int,
+) -> tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, ...]:
+    """Load the font fallback chain at a given size (cached per size)."""
+    return tuple(_load_font(p, size) for p in _FONT_PATHS)
+
+
 def _font_tier(ch: str) -> int:
     """Return 0 (JetBrains), 1 (Noto CJK), or 2 (Symbola) for a character."""
     cp = ord(ch)
@@ -122,17 +223,33 @@ def _font_tier(ch: str) -> int:
 
 
 def _parse_ansi_line(line: str) -> list[StyledSegment]:
-    """Parse a line with ANSI escape codes into styled segments."""
-    # ANSI escape sequence pattern
-    ansi_pattern = re.compile(r"\x1b\[([0-9;]*)m")
+    """Parse a line with ANSI escape codes into styled segments.
 
+    Scans for SGR sequences (``ESC [ <digits/;> m``) with ``str.find``
+    instead of a regex; other escape sequences are kept as literal text.
+    """
     segments: list[StyledSegment] = []
-    current_style = TextStyle()
+    current_style = _DEFAULT_STYLE
+    length = len(line)
     pos = 0
+    search = 0
+
+    while True:
+        start = line.find("\x1b[", search)
+        if start < 0:
+            break
+
+        # Scan parameter characters up to the final "m"
+        end = start + 2
+        while end < length and line[end] in _SGR_PARAM_CHARS:
+            end += 1
+        if end >= length or line[end] != "m":
+            # Not an SGR sequence — leave it in the text
+            search = start + 1
+            continue
 
-    for match in ansi_pattern.finditer(line):
         # Add text before this escape code
-        text_before = line[pos : match.start()]
+        text_before = line[pos:start]
         if text_before:
             # Split by font tier
             for seg_text, tier in _split_line_segments_plain(text_before):
@@ -140,14 +257,14 @@ def _parse_ansi_line(line: str) -> list[StyledSegment]:
                     segments.append(StyledSegment(seg_text, current_style, tier))
 
         # Parse escape code
-        codes = match.group(1)
+        codes = line[start + 2 : end]
         if codes:
             current_style = _apply_ansi_codes(current_style, codes)
         else:
             # Empty code means reset
-            current_style = TextStyle()
+            current_style = _DEFAULT_STYLE
 
-        pos = match.end()
+        pos = search = end + 1
 
     # Add remaining text after last escape code
     text_after = line[pos:]
@@ -156,84 +273,71 @@ def _parse_ansi_line(line: str) -> list[StyledSegment]:
             if seg_text:
                 segments.append(StyledSegment(seg_text, current_style, tier))
 
-    return segments if segments else [StyledSegment("", TextStyle(), 0)]
+    return segments if segments else [StyledSegment("", _DEFAULT_STYLE, 0)]
 
 
 def _apply_ansi_codes(style: TextStyle, codes: str) -> TextStyle:
-    """Apply ANSI color codes to a text style."""
-    # Create a new style (copy current)
-    new_style = TextStyle(
-        fg_color=style.fg_color,
-        bg_color=style.bg_color,
-    )
+    """Apply ANSI color codes to a text style.
+
+    Returns ``style`` itself when the codes leave it unchanged, and the
+    shared default style after a reset; a new TextStyle is allocated only
+    for a genuinely new color combination.
+    """
+    fg: tuple[int, int, int] = style.fg_color
+    bg = style.bg_color
+
+    # Accumulate ";"-separated integers in one pass (empty params are skipped)
+    parts: list[int] = []
+    value = 0
+    has_digit = False
+    for ch in codes:
+        if ch == ";":
+            if has_digit:
+                parts.append(value)
+            value = 0
+            has_digit = False
+        else:
+            value = value * 10 + ord(ch) - 48
+            has_digit = True
+    if has_digit:
+        parts.append(value)
 
-    parts = [int(c) for c in codes.split(";") if c]
+    n = len(parts)
     i = 0
-    while i < len(parts):
+    while i < n:
         code = parts[i]
-
-        if code == 0:  # Reset
-            new_style = TextStyle()
-        elif 30 <= code <= 37:  # Foreground color
-            new_style.fg_color = _ANSI_COLORS[code - 30]
-        elif code == 38:  # Extended foreground color
-            if i + 1 < len(parts) and parts[i + 1] == 5:  # 256 color
-                if i + 2 < len(parts):
-                    color_idx = parts[i + 2] % 256
-                    if color_idx < 16:
-                        new_style.fg_color = _ANSI_COLORS[color_idx]
-                    else:
-                        # Approximate 256 colors (simplified)
-                        new_style.fg_color = _approximate_256_color(color_idx)
-                    i += 2
-            elif i + 1 < len(parts) and parts[i + 1] == 2:  # RGB color
-                if i + 4 < len(parts):
-                    new_style.fg_color = (parts[i + 2], parts[i + 3], parts[i + 4])
-                    i += 4
-        elif code == 39:  # Default foreground
-            new_style.fg_color = _DEFAULT_FG
-        elif 40 <= code <= 47:  # Background color
-            new_style.bg_color = _ANSI_COLORS[code - 40]
-        elif code == 48:  # Extended background color
-            if i + 1 < len(parts) and parts[i + 1] == 5:  # 256 color
-                if i + 2 < len(parts):
-                    color_idx = parts[i + 2] % 256
-                    if color_idx < 16:
-                        new_style.bg_color = _ANSI_COLORS[color_idx]
+        action = _SGR_ACTIONS[code] if code < _SGR_TABLE_SIZE else None
+        if action is not None:
+            kind, color = action
+            if kind == _SGR_FG:
+                fg = color  # type: ignore[assignment]
+            elif kind == _SGR_BG:
+                bg = color
+            elif kind == _SGR_RESET:
+                fg, bg = _DEFAULT_FG, None
+            else:  # Extended color: 38/48 followed by ;5;N or ;2;R;G;B
+                ext: tuple[int, int, int] | None = None
+                if i + 1 < n and parts[i + 1] == 5:  # 256 color
+                    if i + 2 < n:
+                        ext = _PALETTE_256[parts[i + 2] % 256]
+                        i += 2
+                elif i + 1 < n and parts[i + 1] == 2:  # RGB color
+                    if i + 4 < n:
+                        ext = (parts[i + 2], parts[i + 3], parts[i + 4])
+                        i += 4
+                if ext is not None:
+                    if kind == _SGR_EXT_FG:
+                        fg = ext
                     else:
-                        new_style.bg_color = _approximate_256_color(color_idx)
-                    i += 2
-            elif i + 1 < len(parts) and parts[i + 1] == 2:  # RGB color
-                if i + 4 < len(parts):
-                    new_style.bg_color = (parts[i + 2], parts[i + 3], parts[i + 4])
-                    i += 4
-        elif code == 49:  # Default background
-            new_style.bg_color = None
-        elif 90 <= code <= 97:  # Bright foreground color
-            new_style.fg_color = _ANSI_COLORS[code - 90 + 8]
-        elif 100 <= code <= 107:  # Bright background color
-            new_style.bg_color = _ANSI_COLORS[code - 100 + 8]
+                        bg = ext
 
         i += 1
 
-    return new_style
-
-
-def _approximate_256_color(idx: int) -> tuple[int, int, int]:
-    """Approximate a 256-color palette index to RGB."""
-    if idx < 16:
-        return _ANSI_COLORS[idx]
-    elif idx < 232:
-        # 216 color cube: 16 + 36*r + 6*g + b
-        idx -= 16
-        r = (idx // 36) * 51
-        g = ((idx % 36) // 6) * 51
-        b = (idx % 6) * 51
-        return (r, g, b)
-    else:
-        # Grayscale: 232-255
-        gray = 8 + (idx - 232) * 10
-        return (gray, gray, gray)
+    if fg == style.fg_color and bg == style.bg_color:
+        return style
+    if fg == _DEFAULT_FG and bg is None:
+        return _DEFAULT_STYLE
+    return TextStyle(fg, bg)
 
 
 def _split_line_segments_plain(line: str) -> list[tuple[str, int]]:
@@ -256,81 +360,300 @@ def _split_line_segments_plain(line: str) -> list[tuple[str, int]]:
     return segments
 
 
-async def text_to_image(
-    text: str, font_size: int = 28, with_ansi: bool = True
-) -> bytes:
-    """Render monospace text onto a dark-background image and return PNG bytes.
+@functools.lru_cache(maxsize=_RUN_CACHE_SIZE)
+def _render_run(
+    text: str, font_size: int, tier: int
+) -> tuple[Image.Image | None, tuple[int, int]]:
+    """Rasterize a single-font text run into a cached alpha mask.
 
-    Args:
-        text: The text to render (may contain ANSI color codes)
-        font_size: Font size in pixels
-        with_ansi: If True, parse and render ANSI color codes
+    Terminal screenshots repeat the same runs (borders, prompts, status
+    lines) within a pane and across refreshes, so each run goes through
+    FreeType once and is then stamped with ``Image.paste`` in any color.
 
     Returns:
-        PNG image bytes
+        (mask, offset) — ``mask`` is None for runs with no visible area;
+        ``offset`` is the mask's top-left relative to the draw origin.
+    """
+    font = _load_fonts(font_size)[tier]
+    left, top, right, bottom = (int(v) for v in font.getbbox(text))
+    if right <= left or bottom <= top:
+        return None, (left, top)
+    mask = Image.new("L", (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask, (left, top)
+
+
+def _draw_rows(
+    img: Image.Image,
+    rows: list[list[_PlacedRun]],
+    y: int,
+    line_height: int,
+    with_ansi: bool,
+) -> None:
+    """Paint pre-rasterized rows onto ``img`` starting at vertical offset ``y``.
+
+    Only pastes cached masks and fills rectangles (no FreeType calls), so
+    non-adjacent bands of rows can be painted from several threads at once.
+    """
+    draw = ImageDraw.Draw(img)
+    for row in rows:
+        x = _PADDING
+        for style, left, right, mask, offset in row:
+            # Draw background if specified (bottom edge is inclusive, so stop
+            # one pixel short of the next row)
+            if style.bg_color:
+                draw.rectangle(
+                    [x + left, y, x + right, y + line_height - 1],
+                    fill=style.bg_color,
+                )
+
+            # Stamp the cached run mask in the foreground color
+            if mask is not None:
+                fill = style.fg_color if with_ansi else 255
+                img.paste(fill, (x + offset[0], y + offset[1]), mask)
+            x += right - left
+        y += line_height
+
+
+def _measure(
+    text: str,
+    font_tier: int,
+    fonts: tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, ...],
+    cell_width: float,
+) -> tuple[int, int]:
+    """Return the (left, right) pixel extent of a text run."""
+    if font_tier == 0:
+        return 0, int(len(text) * cell_width)
+    bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=fonts[font_tier])
+    return int(bbox[0]), int(bbox[2])
+
+
+def _crop_row(
+    segments: list[StyledSegment],
+    extents: list[tuple[int, int]],
+    max_width: int,
+    fonts: tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, ...],
+    cell_width: float,
+) -> tuple[list[StyledSegment], list[tuple[int, int]], int]:
+    """Cut a row's segments down to at most max_width pixels.
+
+    Returns the kept segments, their extents and the resulting row width.
     """
+    kept: list[StyledSegment] = []
+    kept_extents: list[tuple[int, int]] = []
+    width = 0
+    for seg, (left, right) in zip(segments, extents):
+        if width + right - left > max_width:
+            # Longest prefix of this run that still fits
+            lo, hi = 0, len(seg.text)
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                start, end = _measure(seg.text[:mid], seg.font_tier, fonts, cell_width)
+                if width + end - start <= max_width:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            if lo:
+                text = seg.text[:lo]
+                left, right = _measure(text, seg.font_tier, fonts, cell_width)
+                kept.append(StyledSegment(text, seg.style, seg.font_tier))
+                kept_extents.append((left, right))
+                width += right - left
+            break
+        kept.append(seg)
+        kept_extents.append((left, right))
+        width += right - left
+    return kept, kept_extents, width
+
+
+def _paint_band(
+    mode: str,
+    fill: int | tuple[int, int, int],
+    size: tuple[int, int],
+    top: int,
+    rows: list[list[_PlacedRun]],
+    first_row: int,
+    line_height: int,
+    with_ansi: bool,
+) -> Image.Image:
+    """Paint the canvas strip starting at pixel row ``top`` as its own image.
+
+    rows starts at row index first_row and includes the row just above and
+    below the strip: their glyphs overhang into it by a few pixels (far
+    less than a line). Painting them in serial order onto a private strip
+    gives exactly the pixels a serial render has there, and needs no
+    coordination with the threads painting neighbouring strips.
+    """
+    strip = Image.new(mode, size, fill)
+    _draw_rows(
+        strip, rows, _PADDING + first_row * line_height - top, line_height, with_ansi
+    )
+    return strip
 
-    def _render_image() -> bytes:
-        fonts = [_load_font(p, font_size) for p in _FONT_PATHS]
 
-        lines = text.split("\n")
-        padding = 16
+def _get_band_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool used to paint image bands."""
+    global _band_pool
+    # Renders run in asyncio.to_thread workers; without the lock two
+    # concurrent renders could each create a pool and leak one.
+    with _band_pool_lock:
+        if _band_pool is None:
+            _band_pool = ThreadPoolExecutor(
+                max_workers=_BAND_THREADS, thread_name_prefix="screenshot-band"
+            )
+        return _band_pool
 
-        # Parse lines into styled segments
-        if with_ansi:
-            line_segments = [_parse_ansi_line(line) for line in lines]
-        else:
-            # Legacy plain text mode
-            line_segments_plain = [_split_line_segments_plain(line) for line in lines]
-            line_segments = [
-                [
-                    StyledSegment(seg_text, TextStyle(), tier)
-                    for seg_text, tier in segments
-                ]
-                for segments in line_segments_plain
+
+def _render_png(
+    text: str, font_size: int, with_ansi: bool, compress_level: int
+) -> bytes:
+    """Render text to PNG bytes synchronously (CPU-bound; run off the loop)."""
+    fonts = _load_fonts(font_size)
+
+    # splitlines() drops the trailing empty line a final "\n" would add
+    lines = text.splitlines() or [""]
+
+    # Parse lines into styled segments lazily, one line at a time
+    if with_ansi:
+        line_segments = (_parse_ansi_line(line) for line in lines)
+    else:
+        # Legacy plain text mode
+        line_segments = (
+            [
+                StyledSegment(seg_text, _DEFAULT_STYLE, tier)
+                for seg_text, tier in _split_line_segments_plain(line)
+            ]
+            for line in lines
+        )
+
+    # Measure text size. JetBrains Mono (tier 0) is fixed-pitch, so its runs
+    # are just len(text) cells wide; CJK (double-width) and Symbola
+    # (proportional) runs still go through textbbox.
+    cell_width = fonts[0].getlength("M")
+    # Each segment is measured and rasterized once here (FreeType holds the
+    # GIL); the paint pass below only reuses the extents and cached masks.
+    # Rows are checked against the pixel budget before being rasterized.
+    line_height = int(font_size * 1.4)
+    # Widest row that still fits the budget as a one-line image
+    max_row_width = _MAX_PIXELS // (line_height + _PADDING * 2) - _PADDING * 2
+    rows: list[list[_PlacedRun]] = []
+    max_width = 0
+    for line_no, segments in enumerate(line_segments):
+        extents: list[tuple[int, int]] = []
+        width = 0
+        for seg in segments:
+            left, right = _measure(seg.text, seg.font_tier, fonts, cell_width)
+            extents.append((left, right))
+            width += right - left
+
+        if width > max_row_width:
+            logger.warning(
+                "Screenshot line %d cropped from %dpx to %dpx (pixel limit)",
+                line_no + 1,
+                width,
+                max_row_width,
+            )
+            segments, extents, width = _crop_row(
+                segments, extents, max_row_width, fonts, cell_width
+            )
+
+        canvas_width = max(max_width, width) + _PADDING * 2
+        row_pixels = canvas_width * line_height
+        if row_pixels * (len(rows) + 1) + canvas_width * _PADDING * 2 > _MAX_PIXELS:
+            logger.warning(
+                "Screenshot truncated to %d of %d lines (pixel limit)",
+                len(rows),
+                len(lines),
+            )
+            break
+
+        max_width = max(max_width, width)
+        rows.append(
+            [
+                (seg.style, left, right)
+                + _render_run(seg.text, font_size, seg.font_tier)
+                for seg, (left, right) in zip(segments, extents)
             ]
+        )
 
-        # Measure text size
-        dummy = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy)
-        line_height = int(font_size * 1.4)
-        max_width = 0
-        for segments in line_segments:
-            w = 0
-            for seg in segments:
-                bbox = draw.textbbox((0, 0), seg.text, font=fonts[seg.font_tier])
-                w += bbox[2] - bbox[0]
-            max_width = max(max_width, w)
-
-        img_width = int(max_width) + padding * 2
-        img_height = line_height * len(lines) + padding * 2
+    img_width = int(max_width) + _PADDING * 2
+    img_height = line_height * len(rows) + _PADDING * 2
 
+    if with_ansi:
         img = Image.new("RGB", (img_width, img_height), _DEFAULT_BG)
-        draw = ImageDraw.Draw(img)
+    else:
+        # Single color: draw glyph coverage on an 8-bit canvas, colorized below
+        img = Image.new("L", (img_width, img_height), 0)
+
+    # Tall images are painted as horizontal strips in parallel (paste/fill
+    # release the GIL). Each strip is painted on its own image, together
+    # with the neighbouring rows whose glyphs overhang into it (see
+    # _paint_band), then pasted in place, so the result is pixel-identical
+    # to a serial render.
+    bands = min(_BAND_THREADS, len(rows) // _MIN_BAND_LINES)
+    if bands > 1:
+        band_size = -(-len(rows) // bands)
+        starts = list(range(0, len(rows), band_size))
+        fill = _DEFAULT_BG if with_ansi else 0
+        tops = [0] + [_PADDING + start * line_height for start in starts[1:]]
+        bottoms = tops[1:] + [img_height]
+        futures = []
+        for start, top, bottom in zip(starts, tops, bottoms):
+            first = max(0, start - 1)
+            futures.append(
+                _get_band_pool().submit(
+                    _paint_band,
+                    img.mode,
+                    fill,
+                    (img_width, bottom - top),
+                    top,
+                    rows[first : start + band_size + 1],
+                    first,
+                    line_height,
+                    with_ansi,
+                )
+            )
+        for top, future in zip(tops, futures):
+            img.paste(future.result(), (0, top))
+    else:
+        _draw_rows(img, rows, _PADDING, line_height, with_ansi)
+
+    if not with_ansi:
+        # Turns the "L" canvas into a paletted image: coverage → bg..fg
+        img.putpalette(_PLAIN_PALETTE)
 
-        y = padding
-        for segments in line_segments:
-            x = padding
-            for seg in segments:
-                f = fonts[seg.font_tier]
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=compress_level)
+    return buf.getvalue()
 
-                # Draw background if specified
-                if seg.style.bg_color:
-                    bbox = draw.textbbox((x, y), seg.text, font=f)
-                    draw.rectangle(
-                        [bbox[0], y, bbox[2], y + line_height], fill=seg.style.bg_color
-                    )
 
-                # Draw text with foreground color
-                draw.text((x, y), seg.text, fill=seg.style.fg_color, font=f)
+def shutdown_render_pool() -> None:
+    """Shut down the band-painting thread pool, if started."""
+    global _band_pool
+    with _band_pool_lock:
+        pool, _band_pool = _band_pool, None
+    if pool is not None:
+        pool.shutdown()
 
-                bbox = draw.textbbox((0, 0), seg.text, font=f)
-                x += bbox[2] - bbox[0]
-            y += line_height
 
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        return buf.getvalue()
+async def text_to_image(
+    text: str,
+    font_size: int = _DEFAULT_FONT_SIZE,
+    with_ansi: bool = True,
+    compress_level: int = _DEFAULT_COMPRESS_LEVEL,
+) -> bytes:
+    """Render monospace text onto a dark-background image and return PNG bytes.
+
+    Args:
+        text: The text to render (may contain ANSI color codes)
+        font_size: Font size in pixels
+        with_ansi: If True, parse and render ANSI color codes
+        compress_level: PNG zlib level (0-9); higher is smaller but slower
 
+    Returns:
+        PNG image bytes
+    """
     # Run CPU-intensive image rendering in thread pool
-    return await asyncio.to_thread(_render_image)
+    return await asyncio.to_thread(
+        _render_png, text, font_size, with_ansi, compress_level
+    )
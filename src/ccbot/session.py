@@ -5,9 +5,9 @@ Manages the key mappings:
   User→Thread→Window (thread_bindings): topic-to-window bindings (1 topic = 1 window_id).
 
 Responsibilities:
-  - Persist/load state to ~/.ccbot/state.json.
+  - Persist/load state to ~/.ccbot/state.json (debounced writes, see flush()).
   - Sync window↔session bindings from session_map.json (written by hook).
-  - Resolve window IDs to ClaudeSession objects (JSONL file reading).
+  - Resolve window IDs to their session JSONL files.
   - Track per-user read offsets for unread-message detection.
   - Manage thread↔window bindings for Telegram topic routing.
   - Send keystrokes to tmux windows and retrieve message history.
@@ -22,22 +22,87 @@ Key methods for thread binding access:
 """
 
 import asyncio
-import json
+import functools
+import itertools
 import logging
+import os
+import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from collections.abc import Iterator
 from typing import Any
 
-import aiofiles
+import orjson
 
 from .config import config
 from .tmux_manager import tmux_manager
-from .transcript_parser import TranscriptParser
-from .utils import atomic_write_json
+from .transcript_parser import ParsedEntry, PendingToolInfo, TranscriptParser
+from .utils import atomic_write_bytes, atomic_write_json, read_file_range
 
 logger = logging.getLogger(__name__)
 
+# Top-level keys of state.json, in write order
+_STATE_SECTIONS = (
+    "window_states",
+    "user_window_offsets",
+    "thread_bindings",
+    "window_display_names",
+    "group_chat_ids",
+)
+
+# tmux window IDs: '@' followed by ASCII digits (e.g. '@0', '@12')
+_WINDOW_ID_MATCH = re.compile(r"@[0-9]+\Z").match
+
+# First wait_for_session_map_entry poll delay; doubles up to the caller's interval
+_MIN_POLL_INTERVAL = 0.05
+
+# Most recent get_recent_messages results kept (each holds a parsed range)
+_RECENT_MESSAGES_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=256)
+def _session_file_path(projects_path: Path, session_id: str, cwd: str) -> Path:
+    """Build <projects>/<encoded cwd>/<session_id>.jsonl (cached per window).
+
+    Every window resolve builds this path; joining Paths is comparatively
+    slow and (session_id, cwd) rarely changes.
+    """
+    # Encode cwd: /data/code/ccbot -> -data-code-ccbot
+    encoded_cwd = cwd.replace("/", "-")
+    return projects_path / encoded_cwd / f"{session_id}.jsonl"
+
+
+@dataclass(slots=True)
+class HistoryMessage:
+    """A user/assistant message returned by get_recent_messages."""
+
+    role: str  # "user" | "assistant"
+    text: str
+    content_type: str  # "text" | "thinking" | "tool_use" | ...
+    timestamp: str | None
+
+
+@dataclass
+class _MessageLog:
+    """History messages parsed from a session JSONL file, extended on growth.
+
+    offset sits just past the last parsed complete line. pending_tools
+    carries tool_use blocks still waiting for their tool_result; held keeps
+    a trailing local command invoke (raw), which names the command whose
+    output is on a later line, so it is re-parsed with the appended lines.
+    """
+
+    offset: int = 0
+    messages: list[HistoryMessage] = field(default_factory=list)
+    pending_tools: dict[str, PendingToolInfo] = field(default_factory=dict)
+    held: list[dict] = field(default_factory=list)
+
+
+def _history_messages(parsed: list[ParsedEntry]) -> list[HistoryMessage]:
+    """Convert parsed entries to the messages of get_recent_messages."""
+    return [HistoryMessage(e.role, e.text, e.content_type, e.timestamp) for e in parsed]
+
 
 @dataclass
 class WindowState:
@@ -71,16 +136,6 @@ class WindowState:
         )
 
 
-@dataclass
-class ClaudeSession:
-    """Information about a Claude Code session."""
-
-    session_id: str
-    summary: str
-    message_count: int
-    file_path: str
-
-
 @dataclass
 class SessionManager:
     """Manages session state for Claude Code.
@@ -89,18 +144,19 @@ class SessionManager:
     Display names (window_name) are stored separately for UI presentation.
 
     window_states: window_id -> WindowState (session_id, cwd, window_name)
-    user_window_offsets: user_id -> {window_id -> byte_offset}
-    thread_bindings: user_id -> {thread_id -> window_id}
+    user_window_offsets: (user_id, window_id) -> byte_offset
+    thread_bindings: (user_id, thread_id) -> window_id
     window_display_names: window_id -> window_name (for display)
-    group_chat_ids: "user_id:thread_id" -> group chat_id (for supergroup routing)
+    group_chat_ids: (user_id, thread_id) -> group chat_id (for supergroup routing)
     """
 
     window_states: dict[str, WindowState] = field(default_factory=dict)
-    user_window_offsets: dict[int, dict[str, int]] = field(default_factory=dict)
-    thread_bindings: dict[int, dict[int, str]] = field(default_factory=dict)
+    user_window_offsets: dict[tuple[int, str], int] = field(default_factory=dict)
+    thread_bindings: dict[tuple[int, int], str] = field(default_factory=dict)
     # window_id -> display name (window_name)
     window_display_names: dict[str, str] = field(default_factory=dict)
-    # "user_id:thread_id" -> group chat_id (for supergroup forum topic routing)
+    # (user_id, thread_id) -> group chat_id (for supergroup forum topic routing);
+    # persisted under "user_id:thread_id" string keys.
     # IMPORTANT: This mapping is essential for supergroup/forum topic support.
     # Telegram Bot API requires group chat_id (negative number like -100xxx)
     # as the chat_id parameter when sending messages to forum topics.
@@ -108,30 +164,204 @@ class SessionManager:
     # See: https://core.telegram.org/bots/api#sendmessage
     # History: originally added in 5afc111, erroneously removed in 26cb81f,
     # restored in PR #23.
-    group_chat_ids: dict[str, int] = field(default_factory=dict)
+    group_chat_ids: dict[tuple[int, int], int] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
+        # Debounced persistence: mutations mark state dirty and a single
+        # delayed flush writes it, so bursts of updates cost one write.
+        self._dirty = False
+        self._flush_task: asyncio.Task[None] | None = None
+        self._flush_delay = 0.2
+        self._save_lock = asyncio.Lock()
+        # Cached encoded sections for _encode_state
+        self._state_sections: dict[str, bytes] = {}
+        self._stale_sections: set[str] = set(_STATE_SECTIONS)
+        # Bytes last read from / written to state.json (identical saves skipped)
+        self._written_state: bytes | None = None
+        # Parsed session_map.json keyed by (st_mtime_ns, st_size)
+        self._session_map_cache: tuple[int, int, dict[str, Any]] | None = None
+        # Last session_map version applied by load_session_map; reset whenever
+        # window states change outside it so the next load re-applies the map.
+        self._applied_session_map: dict[str, Any] | None = None
+        # session_map keys for our tmux session: "<session>:" prefix, and a
+        # matcher that also validates the window ID ("<session>:@12" -> "@12")
+        self._session_map_prefix = f"{config.tmux_session_name}:"
+        self._match_session_map_key = re.compile(
+            rf"{re.escape(self._session_map_prefix)}(@[0-9]+)\Z"
+        ).match
+        # Reverse indexes for find_users_for_session (see _rebuild_indexes)
+        self._sid_to_windows: dict[str, set[str]] = {}
+        self._window_threads: dict[str, set[tuple[int, int]]] = {}
+        # Immutable snapshot served by iter_thread_bindings; None = rebuild
+        self._bindings_snapshot: tuple[tuple[int, int, str], ...] | None = None
+        # get_recent_messages results by (path, mtime_ns, size, range), LRU order
+        self._recent_messages: dict[tuple, list[HistoryMessage]] = {}
+        # file path -> parsed history of whole-file reads, LRU order
+        self._message_logs: dict[str, _MessageLog] = {}
+        # _find_session_file caches: session_id -> transcript found by the
+        # project scan, and (projects dir, its mtime_ns, project subdirs)
+        self._found_session_files: dict[str, Path] = {}
+        self._project_dirs: tuple[Path, int, list[str]] | None = None
         self._load_state()
+        self._rebuild_indexes()
 
-    def _save_state(self) -> None:
-        state: dict[str, Any] = {
-            "window_states": {k: v.to_dict() for k, v in self.window_states.items()},
-            "user_window_offsets": {
-                str(uid): offsets for uid, offsets in self.user_window_offsets.items()
-            },
-            "thread_bindings": {
-                str(uid): {str(tid): wid for tid, wid in bindings.items()}
-                for uid, bindings in self.thread_bindings.items()
-            },
-            "window_display_names": self.window_display_names,
-            "group_chat_ids": self.group_chat_ids,
+    def _mark_dirty(self, *sections: str) -> None:
+        """Schedule a debounced state write.
+
+        sections names the changed top-level state keys (all when omitted);
+        unchanged sections reuse their previous encoding. Without a running
+        event loop (startup, scripts) the state is written immediately.
+        """
+        self._stale_sections.update(sections or _STATE_SECTIONS)
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_state()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self._flush_delay)
+        # Detach before writing: flush() only cancels a task that is still
+        # sleeping, never one whose write is already in a worker thread.
+        self._flush_task = None
+        await self._save_state_async()
+
+    async def flush(self) -> None:
+        """Write any pending state changes now (call on shutdown)."""
+        task = self._flush_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self._save_state_async()
+
+    def _build_section(self, name: str) -> Any:
+        """Snapshot one state section as JSON-ready data.
+
+        The snapshot shares no mutable containers with live state, since it
+        is encoded in a worker thread. Int keys are left as-is; orjson
+        stringifies them.
+        """
+        if name == "window_states":
+            return {k: v.to_dict() for k, v in self.window_states.items()}
+        if name == "user_window_offsets":
+            # Persisted nested (user_id -> {window_id -> offset}) as before
+            offsets: dict[int, dict[str, int]] = {}
+            for (uid, wid), offset in self.user_window_offsets.items():
+                offsets.setdefault(uid, {})[wid] = offset
+            return offsets
+        if name == "thread_bindings":
+            # Persisted nested (user_id -> {thread_id -> window_id}) as before
+            bindings: dict[int, dict[int, str]] = {}
+            for (uid, tid), wid in self.thread_bindings.items():
+                bindings.setdefault(uid, {})[tid] = wid
+            return bindings
+        if name == "window_display_names":
+            return dict(self.window_display_names)
+        return {
+            f"{uid}:{tid}": chat_id
+            for (uid, tid), chat_id in self.group_chat_ids.items()
         }
-        atomic_write_json(config.state_file, state)
+
+    def _snapshot_sections(self) -> dict[str, Any]:
+        """Snapshot the sections changed since the last save (on the loop)."""
+        sections = {name: self._build_section(name) for name in self._stale_sections}
+        self._stale_sections.clear()
+        return sections
+
+    def _encode_state(self, sections: dict[str, Any]) -> bytes:
+        """Encode state as indented JSON, re-encoding only the given sections.
+
+        Each section is cached as its '  "name": value' member, indented
+        one level; JSON strings never contain raw newlines, so re-indenting
+        by replacing b"\n" is safe. The output is byte-identical to
+        encoding the whole state dict with OPT_INDENT_2.
+        """
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        for name, data in sections.items():
+            value = orjson.dumps(data, option=option)
+            self._state_sections[name] = b'  "%s": %s' % (
+                name.encode(),
+                value.replace(b"\n", b"\n  "),
+            )
+        members = b",\n".join(self._state_sections[n] for n in _STATE_SECTIONS)
+        return b"{\n" + members + b"\n}"
+
+    def _write_state(self, content: bytes) -> None:
+        atomic_write_bytes(config.state_file, content)
         logger.debug("State saved to %s", config.state_file)
 
-    def _is_window_id(self, key: str) -> bool:
+    def _encode_and_write(self, sections: dict[str, Any]) -> None:
+        # Changes that cancel out (or re-set equal values) leave the file
+        # as is, saving the rewrite and fdatasync.
+        content = self._encode_state(sections)
+        if content != self._written_state:
+            self._write_state(content)
+            self._written_state = content
+
+    def _save_state(self) -> None:
+        self._dirty = False
+        self._encode_and_write(self._snapshot_sections())
+
+    async def _save_state_async(self) -> None:
+        """Write state if dirty, encoding and writing in a worker thread.
+
+        Only the snapshot of changed sections is taken on the event loop.
+        The lock keeps saves in order, so an older snapshot never replaces a
+        newer one and the encoded-section cache is never updated twice at
+        once. A failed write is logged and leaves the state dirty, so the
+        next flush (at the latest on shutdown) retries it from the cached
+        section encodings.
+        """
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            sections = self._snapshot_sections()
+            try:
+                await asyncio.to_thread(self._encode_and_write, sections)
+            except OSError as e:
+                logger.error("Failed to save state to %s: %s", config.state_file, e)
+                self._dirty = True
+
+    @staticmethod
+    def _is_window_id(key: str) -> bool:
         """Check if a key looks like a tmux window ID (e.g. '@0', '@12')."""
-        return key.startswith("@") and len(key) > 1 and key[1:].isdigit()
+        return _WINDOW_ID_MATCH(key) is not None
+
+    def _rebuild_indexes(self) -> None:
+        """Recompute the session_id and thread reverse indexes from scratch."""
+        self._bindings_snapshot = None
+        self._sid_to_windows = {}
+        for wid, ws in self.window_states.items():
+            if ws.session_id:
+                self._sid_to_windows.setdefault(ws.session_id, set()).add(wid)
+        self._window_threads = {}
+        for user_id, thread_id, wid in self.iter_thread_bindings():
+            self._window_threads.setdefault(wid, set()).add((user_id, thread_id))
+
+    def _unindex_session(self, window_id: str, sid: str) -> None:
+        """Remove window_id from sid's _sid_to_windows entry."""
+        wids = self._sid_to_windows.get(sid)
+        if wids is not None:
+            wids.discard(window_id)
+            if not wids:
+                del self._sid_to_windows[sid]
+
+    def _set_window_session(self, window_id: str, state: WindowState, sid: str) -> None:
+        """Change a window's session_id, keeping _sid_to_windows in sync."""
+        if state.session_id:
+            self._unindex_session(window_id, state.session_id)
+        state.session_id = sid
+        self._applied_session_map = None
+        if sid:
+            self._sid_to_windows.setdefault(sid, set()).add(window_id)
 
     def _load_state(self) -> None:
         """Load state synchronously during initialization.
@@ -141,38 +371,41 @@ class SessionManager:
         """
         if config.state_file.exists():
             try:
-                state = json.loads(config.state_file.read_text())
+                content = config.state_file.read_bytes()
+                state = orjson.loads(content)
+                self._written_state = content
+                # Intern window IDs so every container shares one object per ID
                 self.window_states = {
-                    k: WindowState.from_dict(v)
+                    sys.intern(k): WindowState.from_dict(v)
                     for k, v in state.get("window_states", {}).items()
                 }
                 self.user_window_offsets = {
-                    int(uid): offsets
+                    (int(uid), sys.intern(wid)): offset
                     for uid, offsets in state.get("user_window_offsets", {}).items()
+                    for wid, offset in offsets.items()
                 }
                 self.thread_bindings = {
-                    int(uid): {int(tid): wid for tid, wid in bindings.items()}
+                    (int(uid), int(tid)): sys.intern(wid)
                     for uid, bindings in state.get("thread_bindings", {}).items()
+                    for tid, wid in bindings.items()
                 }
-                self.window_display_names = state.get("window_display_names", {})
-                self.group_chat_ids = {
-                    k: int(v) for k, v in state.get("group_chat_ids", {}).items()
+                self.window_display_names = {
+                    sys.intern(k): v
+                    for k, v in state.get("window_display_names", {}).items()
                 }
+                self.group_chat_ids = {}
+                for k, v in state.get("group_chat_ids", {}).items():
+                    uid, _, tid = k.partition(":")
+                    try:
+                        self.group_chat_ids[(int(uid), int(tid))] = int(v)
+                    except ValueError:
+                        logger.warning("Ignoring malformed group_chat_ids key: %s", k)
 
                 # Detect old format: keys that don't look like window IDs
-                needs_migration = False
-                for k in self.window_states:
-                    if not self._is_window_id(k):
-                        needs_migration = True
-                        break
-                if not needs_migration:
-                    for bindings in self.thread_bindings.values():
-                        for wid in bindings.values():
-                            if not self._is_window_id(wid):
-                                needs_migration = True
-                                break
-                        if needs_migration:
-                            break
+                wids = itertools.chain(
+                    self.window_states, self.thread_bindings.values()
+                )
+                needs_migration = not all(map(_WINDOW_ID_MATCH, wids))
 
                 if needs_migration:
                     logger.info(
@@ -181,7 +414,7 @@ class SessionManager:
                     )
                     pass
 
-            except (json.JSONDecodeError, ValueError) as e:
+            except ValueError as e:  # includes orjson.JSONDecodeError
                 logger.warning("Failed to load state: %s", e)
                 self.window_states = {}
                 self.user_window_offsets = {}
@@ -203,200 +436,177 @@ class SessionManager:
         live_by_name: dict[str, str] = {}  # window_name -> window_id
         live_ids: set[str] = set()
         for w in windows:
-            live_by_name[w.window_name] = w.window_id
-            live_ids.add(w.window_id)
+            wid = sys.intern(w.window_id)
+            live_by_name[w.window_name] = wid
+            live_ids.add(wid)
 
-        changed = False
+        # Clean up session_map.json: stale window IDs and old-format keys
+        await self._cleanup_session_map(live_ids)
+
+        # Fast path (e.g. the tmux server outlived the bot): every persisted
+        # key is a live window ID, so there is nothing to remap or drop.
+        persisted = itertools.chain(
+            self.window_states,
+            self.thread_bindings.values(),
+            (wid for _, wid in self.user_window_offsets),
+        )
+        if live_ids.issuperset(persisted):
+            return
 
-        # --- Migrate window_states ---
-        new_window_states: dict[str, WindowState] = {}
-        for key, ws in self.window_states.items():
-            if self._is_window_id(key):
-                if key in live_ids:
-                    new_window_states[key] = ws
-                else:
+        # Every persisted key (window_states keys, binding values, offset keys)
+        # is resolved once here; the three containers then share the remap.
+        remap: dict[str, str | None] = {}  # persisted key -> live window_id
+
+        def resolve(key: str, name: str = "") -> str | None:
+            if key in remap:
+                return remap[key]
+            new_id: str | None = key
+            if key not in live_ids:
+                if self._is_window_id(key):
                     # Stale ID — try re-resolve by display name
-                    display = self.window_display_names.get(key, ws.window_name or key)
-                    new_id = live_by_name.get(display)
-                    if new_id:
-                        logger.info(
-                            "Re-resolved stale window_id %s -> %s (name=%s)",
-                            key,
-                            new_id,
-                            display,
-                        )
-                        new_window_states[new_id] = ws
-                        ws.window_name = display
-                        self.window_display_names[new_id] = display
-                        self.window_display_names.pop(key, None)
-                        changed = True
-                    else:
-                        logger.info(
-                            "Dropping stale window_state: %s (name=%s)", key, display
-                        )
-                        changed = True
-            else:
-                # Old format: key is window_name
-                new_id = live_by_name.get(key)
-                if new_id:
-                    logger.info("Migrating window_state key %s -> %s", key, new_id)
-                    ws.window_name = key
-                    new_window_states[new_id] = ws
-                    self.window_display_names[new_id] = key
-                    changed = True
+                    name = self.window_display_names.get(key, name or key)
                 else:
+                    # Old format: key is window_name
+                    name = key
+                new_id = live_by_name.get(name)
+                if new_id:
                     logger.info(
-                        "Dropping old-format window_state: %s (no live window)", key
+                        "Re-resolved window key %s -> %s (name=%s)", key, new_id, name
                     )
-                    changed = True
+                    self.window_display_names[new_id] = name
+                else:
+                    logger.info("Dropping window key %s (no live window)", key)
+            remap[key] = new_id
+            return new_id
+
+        # --- Migrate window_states (moving only remapped index entries) ---
+        sid_index = self._sid_to_windows
+        new_window_states: dict[str, WindowState] = {}
+        for key, ws in self.window_states.items():
+            new_id = resolve(key, ws.window_name)
+            if new_id != key:
+                self._unindex_session(key, ws.session_id)
+            if new_id is None:
+                continue
+            if new_id != key:
+                ws.window_name = self.window_display_names[new_id]
+            replaced = new_window_states.get(new_id)
+            if replaced is not None:
+                self._unindex_session(new_id, replaced.session_id)
+            new_window_states[new_id] = ws
+            if ws.session_id:
+                sid_index.setdefault(ws.session_id, set()).add(new_id)
         self.window_states = new_window_states
 
         # --- Migrate thread_bindings ---
-        for uid, bindings in self.thread_bindings.items():
-            new_bindings: dict[int, str] = {}
-            for tid, val in bindings.items():
-                if self._is_window_id(val):
-                    if val in live_ids:
-                        new_bindings[tid] = val
-                    else:
-                        display = self.window_display_names.get(val, val)
-                        new_id = live_by_name.get(display)
-                        if new_id:
-                            logger.info(
-                                "Re-resolved thread binding %s -> %s (name=%s)",
-                                val,
-                                new_id,
-                                display,
-                            )
-                            new_bindings[tid] = new_id
-                            self.window_display_names[new_id] = display
-                            changed = True
-                        else:
-                            logger.info(
-                                "Dropping stale thread binding: user=%d, thread=%d, wid=%s",
-                                uid,
-                                tid,
-                                val,
-                            )
-                            changed = True
-                else:
-                    # Old format: val is window_name
-                    new_id = live_by_name.get(val)
-                    if new_id:
-                        logger.info("Migrating thread binding %s -> %s", val, new_id)
-                        new_bindings[tid] = new_id
-                        self.window_display_names[new_id] = val
-                        changed = True
-                    else:
-                        logger.info(
-                            "Dropping old-format thread binding: user=%d, thread=%d, name=%s",
-                            uid,
-                            tid,
-                            val,
-                        )
-                        changed = True
-            self.thread_bindings[uid] = new_bindings
-
-        # Remove empty user entries
-        empty_users = [uid for uid, b in self.thread_bindings.items() if not b]
-        for uid in empty_users:
-            del self.thread_bindings[uid]
+        new_thread_bindings: dict[tuple[int, int], str] = {}
+        for (uid, tid), val in self.thread_bindings.items():
+            new_id = resolve(val)
+            if new_id is None:
+                logger.info(
+                    "Dropping stale thread binding: user=%d, thread=%d, key=%s",
+                    uid,
+                    tid,
+                    val,
+                )
+            else:
+                new_thread_bindings[(uid, tid)] = new_id
+        self.thread_bindings = new_thread_bindings
 
         # --- Migrate user_window_offsets ---
-        for uid, offsets in self.user_window_offsets.items():
-            new_offsets: dict[str, int] = {}
-            for key, offset in offsets.items():
-                if self._is_window_id(key):
-                    if key in live_ids:
-                        new_offsets[key] = offset
-                    else:
-                        display = self.window_display_names.get(key, key)
-                        new_id = live_by_name.get(display)
-                        if new_id:
-                            new_offsets[new_id] = offset
-                            changed = True
-                        else:
-                            changed = True
-                else:
-                    new_id = live_by_name.get(key)
-                    if new_id:
-                        new_offsets[new_id] = offset
-                        changed = True
-                    else:
-                        changed = True
-            self.user_window_offsets[uid] = new_offsets
+        self.user_window_offsets = {
+            (uid, new_id): offset
+            for (uid, key), offset in self.user_window_offsets.items()
+            if (new_id := resolve(key)) is not None
+        }
+
+        # Display names of remapped stale IDs now live under the new ID
+        for key, new_id in remap.items():
+            if new_id and new_id != key and self._is_window_id(key):
+                self.window_display_names.pop(key, None)
+
+        # Move thread index entries of remapped IDs; dropped IDs lose theirs
+        for key, new_id in remap.items():
+            if new_id == key:
+                continue
+            threads = self._window_threads.pop(key, None)
+            if threads and new_id:
+                self._window_threads.setdefault(new_id, set()).update(threads)
+        self._bindings_snapshot = None
+
+        changed = any(key != new_id for key, new_id in remap.items())
+        self._applied_session_map = None
 
         if changed:
-            self._save_state()
+            self._mark_dirty()
             logger.info("Startup re-resolution complete")
 
-        # Clean up session_map.json: stale window IDs and old-format keys
-        await self._cleanup_stale_session_map_entries(live_ids)
-        await self._cleanup_old_format_session_map_keys()
+    async def _read_session_map(self) -> dict[str, Any] | None:
+        """Return parsed session_map.json, re-reading only when it changed.
 
-    async def _cleanup_old_format_session_map_keys(self) -> None:
-        """Remove old-format keys (window_name instead of @window_id) from session_map.json."""
-        if not config.session_map_file.exists():
-            return
+        The hook replaces the file atomically, so (mtime, size) identifies a
+        version. Returns None if the file is missing or unreadable. The
+        returned dict is shared with the cache and must not be mutated.
+        """
         try:
-            async with aiofiles.open(config.session_map_file, "r") as f:
-                content = await f.read()
-            session_map = json.loads(content)
-        except (json.JSONDecodeError, OSError):
-            return
-
-        prefix = f"{config.tmux_session_name}:"
-        old_keys = [
-            key
-            for key in session_map
-            if key.startswith(prefix) and not self._is_window_id(key[len(prefix) :])
-        ]
-        if not old_keys:
-            return
-
-        for key in old_keys:
-            del session_map[key]
-        atomic_write_json(config.session_map_file, session_map)
-        logger.info(
-            "Cleaned up %d old-format session_map keys: %s", len(old_keys), old_keys
-        )
+            st = config.session_map_file.stat()
+        except OSError:
+            self._session_map_cache = None
+            return None
+        cached = self._session_map_cache
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        try:
+            content = await asyncio.to_thread(read_file_range, config.session_map_file)
+            session_map = orjson.loads(content)
+        except (orjson.JSONDecodeError, OSError):
+            return None
+        self._session_map_cache = (st.st_mtime_ns, st.st_size, session_map)
+        return session_map
 
-    async def _cleanup_stale_session_map_entries(self, live_ids: set[str]) -> None:
-        """Remove entries for tmux windows that no longer exist.
+    async def _cleanup_session_map(self, live_ids: set[str]) -> None:
+        """Remove our dead entries from session_map.json in one rewrite.
 
-        When windows are closed externally (outside ccbot), session_map.json
-        retains orphan references. This cleanup removes entries whose window_id
-        is not in the current set of live tmux windows.
+        Drops stale entries, whose window_id is not a live tmux window (e.g.
+        closed outside ccbot), and old-format keys (window_name instead of
+        @window_id). The file is rewritten in a worker thread.
         """
-        if not config.session_map_file.exists():
-            return
-        try:
-            async with aiofiles.open(config.session_map_file, "r") as f:
-                content = await f.read()
-            session_map = json.loads(content)
-        except (json.JSONDecodeError, OSError):
+        cached = await self._read_session_map()
+        if cached is None:
             return
 
-        prefix = f"{config.tmux_session_name}:"
-        stale_keys = [
-            key
-            for key in session_map
-            if key.startswith(prefix)
-            and self._is_window_id(key[len(prefix) :])
-            and key[len(prefix) :] not in live_ids
-        ]
-        if not stale_keys:
+        prefix = self._session_map_prefix
+        match = self._match_session_map_key
+        stale_keys: list[str] = []
+        old_keys: list[str] = []
+        # The anchored matcher classifies modern keys in one C-level call;
+        # only misses need the prefix check to spot our old-format keys.
+        for key in cached:
+            m = match(key)
+            if m is not None:
+                if m.group(1) not in live_ids:
+                    stale_keys.append(key)
+            elif key.startswith(prefix):
+                old_keys.append(key)
+        if not stale_keys and not old_keys:
             return
 
+        removed = {*stale_keys, *old_keys}
+        session_map = {k: v for k, v in cached.items() if k not in removed}
+        await asyncio.to_thread(atomic_write_json, config.session_map_file, session_map)
         for key in stale_keys:
-            del session_map[key]
             logger.info("Removed stale session_map entry: %s", key)
-
-        atomic_write_json(config.session_map_file, session_map)
-        logger.info(
-            "Cleaned up %d stale session_map entries (windows no longer in tmux)",
-            len(stale_keys),
-        )
+        if stale_keys:
+            logger.info(
+                "Cleaned up %d stale session_map entries (windows no longer in tmux)",
+                len(stale_keys),
+            )
+        if old_keys:
+            logger.info(
+                "Cleaned up %d old-format session_map keys: %s",
+                len(old_keys),
+                old_keys,
+            )
 
     # --- Display name management ---
 
@@ -421,10 +631,10 @@ class SessionManager:
         "Message thread not found". See commit history: 5afc111 → 26cb81f → PR #23.
         """
         tid = thread_id or 0
-        key = f"{user_id}:{tid}"
+        key = (user_id, tid)
         if self.group_chat_ids.get(key) != chat_id:
             self.group_chat_ids[key] = chat_id
-            self._save_state()
+            self._mark_dirty("group_chat_ids")
             logger.debug(
                 "Stored group chat_id: user=%d, thread=%s, chat_id=%d",
                 user_id,
@@ -444,8 +654,7 @@ class SessionManager:
         supergroup forum topic routing.
         """
         if thread_id is not None:
-            key = f"{user_id}:{thread_id}"
-            group_id = self.group_chat_ids.get(key)
+            group_id = self.group_chat_ids.get((user_id, thread_id))
             if group_id is not None:
                 return group_id
         return user_id
@@ -455,6 +664,11 @@ class SessionManager:
     ) -> bool:
         """Poll session_map.json until an entry for window_id appears.
 
+        The hook usually fires within a few hundred milliseconds, so polling
+        starts at _MIN_POLL_INTERVAL and backs off exponentially to interval.
+        Unchanged polls cost a single stat (see _read_session_map), and the
+        last sleep is cut short so the wait never overruns timeout.
+
         Returns True if the entry was found within timeout, False otherwise.
         """
         logger.debug(
@@ -462,25 +676,24 @@ class SessionManager:
             window_id,
             timeout,
         )
-        key = f"{config.tmux_session_name}:{window_id}"
-        deadline = asyncio.get_event_loop().time() + timeout
-        while asyncio.get_event_loop().time() < deadline:
-            try:
-                if config.session_map_file.exists():
-                    async with aiofiles.open(config.session_map_file, "r") as f:
-                        content = await f.read()
-                    session_map = json.loads(content)
-                    info = session_map.get(key, {})
-                    if info.get("session_id"):
-                        # Found — load into window_states immediately
-                        logger.debug(
-                            "session_map entry found for window_id %s", window_id
-                        )
-                        await self.load_session_map()
-                        return True
-            except (json.JSONDecodeError, OSError):
-                pass
-            await asyncio.sleep(interval)
+        key = self._session_map_prefix + window_id
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = min(_MIN_POLL_INTERVAL, interval)
+        checked: dict[str, Any] | None = None
+        while (remaining := deadline - loop.time()) > 0:
+            session_map = await self._read_session_map()
+            # An unchanged map is the same cached object; skip the lookup
+            if session_map is not None and session_map is not checked:
+                checked = session_map
+                info = session_map.get(key)
+                if info and info.get("session_id"):
+                    # Found — load into window_states immediately
+                    logger.debug("session_map entry found for window_id %s", window_id)
+                    await self.load_session_map()
+                    return True
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, interval)
         logger.warning(
             "Timed out waiting for session_map entry: window_id=%s", window_id
         )
@@ -493,27 +706,23 @@ class SessionManager:
         Only entries matching our tmux_session_name are processed.
         Also cleans up window_states entries not in current session_map.
         Updates window_display_names from the "window_name" field in values.
+        Returns immediately if the same map version was already applied and
+        window states have not changed since.
         """
-        if not config.session_map_file.exists():
-            return
-        try:
-            async with aiofiles.open(config.session_map_file, "r") as f:
-                content = await f.read()
-            session_map = json.loads(content)
-        except (json.JSONDecodeError, OSError):
+        session_map = await self._read_session_map()
+        if session_map is None or session_map is self._applied_session_map:
             return
 
-        prefix = f"{config.tmux_session_name}:"
+        match = self._match_session_map_key
         valid_wids: set[str] = set()
         changed = False
 
         for key, info in session_map.items():
-            # Only process entries for our tmux session
-            if not key.startswith(prefix):
-                continue
-            window_id = key[len(prefix) :]
-            if not self._is_window_id(window_id):
+            # Only process "<our session>:@<id>" entries
+            m = match(key)
+            if m is None:
                 continue
+            window_id = sys.intern(m.group(1))
             valid_wids.add(window_id)
             new_sid = info.get("session_id", "")
             new_cwd = info.get("cwd", "")
@@ -528,25 +737,29 @@ class SessionManager:
                     new_sid,
                     new_cwd,
                 )
-                state.session_id = new_sid
+                self._set_window_session(window_id, state, new_sid)
                 state.cwd = new_cwd
                 changed = True
             # Update display name
             if new_wname:
-                state.window_name = new_wname
+                if state.window_name != new_wname:
+                    state.window_name = new_wname
+                    changed = True
                 if self.window_display_names.get(window_id) != new_wname:
                     self.window_display_names[window_id] = new_wname
                     changed = True
 
         # Clean up window_states entries not in current session_map.
-        stale_wids = [w for w in self.window_states if w and w not in valid_wids]
+        stale_wids = self.window_states.keys() - valid_wids
+        stale_wids.discard("")
         for wid in stale_wids:
             logger.info("Removing stale window_state: %s", wid)
-            del self.window_states[wid]
+            self._set_window_session(wid, self.window_states.pop(wid), "")
             changed = True
 
+        self._applied_session_map = session_map
         if changed:
-            self._save_state()
+            self._mark_dirty("window_states", "window_display_names")
 
     # --- Window state management ---
 
@@ -554,116 +767,116 @@ class SessionManager:
         """Get or create window state."""
         if window_id not in self.window_states:
             self.window_states[window_id] = WindowState()
+            self._applied_session_map = None
         return self.window_states[window_id]
 
     def clear_window_session(self, window_id: str) -> None:
         """Clear session association for a window (e.g., after /clear command)."""
         state = self.get_window_state(window_id)
-        state.session_id = ""
-        self._save_state()
+        self._set_window_session(window_id, state, "")
+        self._mark_dirty("window_states")
         logger.info("Cleared session for window_id %s", window_id)
 
     def _build_session_file_path(self, session_id: str, cwd: str) -> Path | None:
         """Build the direct file path for a session from session_id and cwd."""
         if not session_id or not cwd:
             return None
-        # Encode cwd: /data/code/ccbot -> -data-code-ccbot
-        encoded_cwd = cwd.replace("/", "-")
-        return config.claude_projects_path / encoded_cwd / f"{session_id}.jsonl"
+        return _session_file_path(config.claude_projects_path, session_id, cwd)
 
-    async def _get_session_direct(
+    async def _stat_session(
         self, session_id: str, cwd: str
-    ) -> ClaudeSession | None:
-        """Get a ClaudeSession directly from session_id and cwd (no scanning)."""
-        file_path = self._build_session_file_path(session_id, cwd)
+    ) -> tuple[Path, os.stat_result] | None:
+        """Locate a session's JSONL file and stat it, with one stat on a hit.
 
-        # Fallback: glob search if direct path doesn't exist
-        if not file_path or not file_path.exists():
-            pattern = f"*/{session_id}.jsonl"
-            matches = list(config.claude_projects_path.glob(pattern))
-            if matches:
-                file_path = matches[0]
-                logger.debug("Found session via glob: %s", file_path)
-            else:
-                return None
+        Falls back to searching the project dirs when the file is not at
+        the path derived from cwd. Returns None if it cannot be found.
+        """
+        file_path = self._build_session_file_path(session_id, cwd)
+        if file_path is not None:
+            try:
+                return file_path, file_path.stat()
+            except OSError:
+                pass
 
-        # Single pass: read file once, extract summary + count messages
-        summary = ""
-        last_user_msg = ""
-        message_count = 0
+        # Fallback: search project dirs if direct path doesn't exist
+        file_path = await asyncio.to_thread(self._find_session_file, session_id)
+        if file_path is None:
+            return None
+        logger.debug("Found session via project scan: %s", file_path)
         try:
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                async for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    message_count += 1
-                    try:
-                        data = json.loads(line)
-                        # Check for summary
-                        if data.get("type") == "summary":
-                            s = data.get("summary", "")
-                            if s:
-                                summary = s
-                        # Track last user message as fallback
-                        elif TranscriptParser.is_user_message(data):
-                            parsed = TranscriptParser.parse_message(data)
-                            if parsed and parsed.text.strip():
-                                last_user_msg = parsed.text.strip()
-                    except json.JSONDecodeError:
-                        continue
+            return file_path, file_path.stat()
         except OSError:
             return None
 
-        if not summary:
-            summary = last_user_msg[:50] if last_user_msg else "Untitled"
+    def _find_session_file(self, session_id: str) -> Path | None:
+        """Find <project>/<session_id>.jsonl under the Claude projects dir.
 
-        return ClaudeSession(
-            session_id=session_id,
-            summary=summary,
-            message_count=message_count,
-            file_path=str(file_path),
-        )
+        The leaf name is known, so one stat per project directory replaces
+        glob's listing and pattern-matching of every transcript. A previous
+        hit is re-checked with a single stat, and the project directories
+        are only re-listed when the projects dir mtime changes.
+        """
+        found = self._found_session_files.get(session_id)
+        if found is not None:
+            if found.is_file():
+                return found
+            del self._found_session_files[session_id]
+
+        projects = config.claude_projects_path
+        try:
+            mtime_ns = projects.stat().st_mtime_ns
+            cached = self._project_dirs
+            if cached is not None and cached[:2] == (projects, mtime_ns):
+                dirs = cached[2]
+            else:
+                with os.scandir(projects) as it:
+                    dirs = [entry.path for entry in it if entry.is_dir()]
+                self._project_dirs = (projects, mtime_ns, dirs)
+        except OSError:
+            return None
+
+        name = f"{session_id}.jsonl"
+        for d in dirs:
+            candidate = Path(d, name)
+            if candidate.is_file():
+                self._found_session_files[session_id] = candidate
+                return candidate
+        return None
 
     # --- Window → Session resolution ---
 
-    async def resolve_session_for_window(self, window_id: str) -> ClaudeSession | None:
-        """Resolve a tmux window to the best matching Claude session.
+    async def stat_session_file(
+        self, window_id: str
+    ) -> tuple[Path, os.stat_result] | None:
+        """Resolve a tmux window to its session JSONL file and stat it.
 
-        Uses persisted session_id + cwd to construct file path directly.
-        Returns None if no session is associated with this window.
+        For callers that only need the file (read offsets, history); the
+        file itself is not read.
         """
-        state = self.get_window_state(window_id)
-
-        if not state.session_id or not state.cwd:
+        state = self.window_states.get(window_id)
+        if state is None or not state.session_id or not state.cwd:
             return None
+        return await self._stat_session(state.session_id, state.cwd)
 
-        session = await self._get_session_direct(state.session_id, state.cwd)
-        if session:
-            return session
-
-        # File no longer exists, clear state
-        logger.warning(
-            "Session file no longer exists for window_id %s (sid=%s, cwd=%s)",
-            window_id,
-            state.session_id,
-            state.cwd,
-        )
-        state.session_id = ""
-        state.cwd = ""
-        self._save_state()
-        return None
+    async def resolve_session_file(self, window_id: str) -> Path | None:
+        """Resolve a tmux window to its session JSONL file without reading it."""
+        found = await self.stat_session_file(window_id)
+        return found[0] if found else None
 
     # --- User window offset management ---
 
     def update_user_window_offset(
         self, user_id: int, window_id: str, offset: int
     ) -> None:
-        """Update the user's last read offset for a window."""
-        if user_id not in self.user_window_offsets:
-            self.user_window_offsets[user_id] = {}
-        self.user_window_offsets[user_id][window_id] = offset
-        self._save_state()
+        """Update the user's last read offset for a window.
+
+        Messages from one transcript read all report the same file size, so
+        only an actual change schedules a state write.
+        """
+        key = (user_id, sys.intern(window_id))
+        if self.user_window_offsets.get(key) != offset:
+            self.user_window_offsets[key] = offset
+            self._mark_dirty("user_window_offsets")
 
     # --- Thread binding management ---
 
@@ -678,12 +891,22 @@ class SessionManager:
             window_id: Tmux window ID (e.g. '@0')
             window_name: Display name for the window (optional)
         """
-        if user_id not in self.thread_bindings:
-            self.thread_bindings[user_id] = {}
-        self.thread_bindings[user_id][thread_id] = window_id
-        if window_name:
+        window_id = sys.intern(window_id)
+        key = (user_id, thread_id)
+        old_wid = self.thread_bindings.get(key)
+        changed = old_wid != window_id
+        if changed:
+            if old_wid is not None:
+                self._window_threads.get(old_wid, set()).discard(key)
+            self.thread_bindings[key] = window_id
+            self._window_threads.setdefault(window_id, set()).add(key)
+            self._bindings_snapshot = None
+        if window_name and self.window_display_names.get(window_id) != window_name:
             self.window_display_names[window_id] = window_name
-        self._save_state()
+            self._applied_session_map = None
+            changed = True
+        if changed:
+            self._mark_dirty("thread_bindings", "window_display_names")
         display = window_name or self.get_display_name(window_id)
         logger.info(
             "Bound thread %d -> window_id %s (%s) for user %d",
@@ -695,13 +918,16 @@ class SessionManager:
 
     def unbind_thread(self, user_id: int, thread_id: int) -> str | None:
         """Remove a thread binding. Returns the previously bound window_id, or None."""
-        bindings = self.thread_bindings.get(user_id)
-        if not bindings or thread_id not in bindings:
+        window_id = self.thread_bindings.pop((user_id, thread_id), None)
+        if window_id is None:
             return None
-        window_id = bindings.pop(thread_id)
-        if not bindings:
-            del self.thread_bindings[user_id]
-        self._save_state()
+        threads = self._window_threads.get(window_id)
+        if threads is not None:
+            threads.discard((user_id, thread_id))
+            if not threads:
+                del self._window_threads[window_id]
+        self._bindings_snapshot = None
+        self._mark_dirty("thread_bindings")
         logger.info(
             "Unbound thread %d (was %s) for user %d",
             thread_id,
@@ -712,10 +938,7 @@ class SessionManager:
 
     def get_window_for_thread(self, user_id: int, thread_id: int) -> str | None:
         """Look up the window_id bound to a thread."""
-        bindings = self.thread_bindings.get(user_id)
-        if not bindings:
-            return None
-        return bindings.get(thread_id)
+        return self.thread_bindings.get((user_id, thread_id))
 
     def resolve_window_for_thread(
         self,
@@ -728,17 +951,22 @@ class SessionManager:
         """
         if thread_id is None:
             return None
-        return self.get_window_for_thread(user_id, thread_id)
+        return self.thread_bindings.get((user_id, thread_id))
 
     def iter_thread_bindings(self) -> Iterator[tuple[int, int, str]]:
         """Iterate all thread bindings as (user_id, thread_id, window_id).
 
         Provides encapsulated access to thread_bindings without exposing
-        the internal data structure directly.
+        the internal data structure directly. Iterates an immutable snapshot
+        (cached until bindings change), so callers may bind/unbind or await
+        while iterating.
         """
-        for user_id, bindings in self.thread_bindings.items():
-            for thread_id, window_id in bindings.items():
-                yield user_id, thread_id, window_id
+        if self._bindings_snapshot is None:
+            self._bindings_snapshot = tuple(
+                (user_id, thread_id, window_id)
+                for (user_id, thread_id), window_id in self.thread_bindings.items()
+            )
+        return iter(self._bindings_snapshot)
 
     async def find_users_for_session(
         self,
@@ -746,12 +974,17 @@ class SessionManager:
     ) -> list[tuple[int, str, int]]:
         """Find all users whose thread-bound window maps to the given session_id.
 
+        Uses the session_id -> windows and window -> threads reverse indexes,
+        so no transcript files are read.
+
         Returns list of (user_id, window_id, thread_id) tuples.
         """
         result: list[tuple[int, str, int]] = []
-        for user_id, thread_id, window_id in self.iter_thread_bindings():
-            resolved = await self.resolve_session_for_window(window_id)
-            if resolved and resolved.session_id == session_id:
+        for window_id in self._sid_to_windows.get(session_id, ()):
+            state = self.window_states.get(window_id)
+            if state is None or not state.cwd:
+                continue
+            for user_id, thread_id in self._window_threads.get(window_id, ()):
                 result.append((user_id, window_id, thread_id))
         return result
 
@@ -759,19 +992,19 @@ class SessionManager:
 
     async def send_to_window(self, window_id: str, text: str) -> tuple[bool, str]:
         """Send text to a tmux window by ID."""
-        display = self.get_display_name(window_id)
-        logger.debug(
-            "send_to_window: window_id=%s (%s), text_len=%d",
-            window_id,
-            display,
-            len(text),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "send_to_window: window_id=%s (%s), text_len=%d",
+                window_id,
+                self.get_display_name(window_id),
+                len(text),
+            )
         window = await tmux_manager.find_window_by_id(window_id)
         if not window:
             return False, "Window not found (may have been closed)"
         success = await tmux_manager.send_keys(window.window_id, text)
         if success:
-            return True, f"Sent to {display}"
+            return True, f"Sent to {self.get_display_name(window_id)}"
         return False, "Failed to send keys"
 
     # --- Message history ---
@@ -782,58 +1015,154 @@ class SessionManager:
         *,
         start_byte: int = 0,
         end_byte: int | None = None,
-    ) -> tuple[list[dict], int]:
+    ) -> tuple[list[HistoryMessage], int]:
         """Get user/assistant messages for a window's session.
 
         Resolves window → session, then reads the JSONL.
-        Supports byte range filtering via start_byte/end_byte.
+        Supports byte range filtering via start_byte/end_byte. A full read
+        (no range) is limited to the last config.recent_messages_tail_bytes
+        bytes when that is set. Results are cached while the file's mtime
+        and size are unchanged.
         Returns (messages, total_count).
         """
-        session = await self.resolve_session_for_window(window_id)
-        if not session or not session.file_path:
-            return [], 0
-
-        file_path = Path(session.file_path)
-        if not file_path.exists():
+        found = await self.stat_session_file(window_id)
+        if found is None:
             return [], 0
+        file_path, st = found
 
-        # Read JSONL entries (optionally filtered by byte range)
-        entries: list[dict] = []
+        # Read JSONL entries (optionally filtered by byte range) in one read;
+        # byte offsets come from line boundaries, so the range holds whole lines
+        tail_bytes = config.recent_messages_tail_bytes
+        tail_read = False
         try:
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                if start_byte > 0:
-                    await f.seek(start_byte)
-
-                while True:
-                    # Check byte limit before reading
-                    if end_byte is not None:
-                        current_pos = await f.tell()
-                        if current_pos >= end_byte:
-                            break
-
-                    line = await f.readline()
-                    if not line:
-                        break
-
-                    data = TranscriptParser.parse_line(line)
-                    if data:
-                        entries.append(data)
+            # Unchanged file and range: reuse the parsed messages (LRU)
+            key = (
+                str(file_path),
+                st.st_mtime_ns,
+                st.st_size,
+                start_byte,
+                end_byte,
+                tail_bytes,
+            )
+            cached = self._recent_messages.pop(key, None)
+            if cached is not None:
+                self._recent_messages[key] = cached
+                return list(cached), len(cached)
+            full_read = start_byte == 0 and end_byte is None
+            if full_read and 0 < tail_bytes < st.st_size:
+                # Include the preceding byte so a tail starting exactly on
+                # a line boundary keeps that line; drop the partial line.
+                start_byte = st.st_size - tail_bytes - 1
+                tail_read = True
+            if full_read and not tail_read:
+                all_messages = await self._read_all_messages(file_path, st.st_size)
+            else:
+                all_messages = await asyncio.to_thread(
+                    self._parse_message_range,
+                    file_path,
+                    start_byte,
+                    end_byte,
+                    tail_read,
+                )
         except OSError as e:
             logger.error("Error reading session file %s: %s", file_path, e)
             return [], 0
 
-        parsed_entries, _ = TranscriptParser.parse_entries(entries)
-        all_messages = [
-            {
-                "role": e.role,
-                "text": e.text,
-                "content_type": e.content_type,
-                "timestamp": e.timestamp,
-            }
-            for e in parsed_entries
-        ]
-
-        return all_messages, len(all_messages)
+        self._recent_messages[key] = all_messages
+        if len(self._recent_messages) > _RECENT_MESSAGES_CACHE_SIZE:
+            del self._recent_messages[next(iter(self._recent_messages))]
+        return list(all_messages), len(all_messages)
+
+    async def _read_all_messages(
+        self, file_path: Path, size: int
+    ) -> list[HistoryMessage]:
+        """Parse a whole session file, reading only bytes appended since last time.
+
+        Transcripts are append-only; a file that shrank is parsed afresh.
+        A trailing line without a newline is still being written: it is
+        parsed for this result but not kept in the log.
+        """
+        key = str(file_path)
+        log = self._message_logs.get(key)
+        if log is None or size < log.offset:
+            log = _MessageLog()
+        log, messages = await asyncio.to_thread(
+            self._advance_message_log, log, file_path
+        )
+        self._message_logs.pop(key, None)
+        self._message_logs[key] = log
+        if len(self._message_logs) > _RECENT_MESSAGES_CACHE_SIZE:
+            del self._message_logs[next(iter(self._message_logs))]
+        return messages
+
+    @classmethod
+    def _advance_message_log(
+        cls, log: _MessageLog, file_path: Path
+    ) -> tuple[_MessageLog, list[HistoryMessage]]:
+        """Read and parse file_path past log.offset (blocking, for to_thread).
+
+        Returns the extended log and the messages of the whole file.
+        """
+        content = read_file_range(file_path, log.offset)
+        end = content.rfind(b"\n") + 1
+        if end:
+            log = cls._extend_message_log(log, content[:end])
+        parsed, pending = TranscriptParser.parse_entries(
+            log.held + cls._decode_entries(content[end:]), log.pending_tools
+        )
+        return log, (
+            log.messages
+            + _history_messages(parsed)
+            + _history_messages(TranscriptParser.pending_tool_entries(pending))
+        )
+
+    @classmethod
+    def _parse_message_range(
+        cls, file_path: Path, start_byte: int, end_byte: int | None, tail_read: bool
+    ) -> list[HistoryMessage]:
+        """Read and parse bytes [start_byte, end_byte) (blocking, for to_thread).
+
+        For a tail read, the partial line at the start is dropped.
+        """
+        content = read_file_range(file_path, start_byte, end_byte)
+        if tail_read:
+            content = content[content.find(b"\n") + 1 :]
+        parsed_entries, _ = TranscriptParser.parse_entries(cls._decode_entries(content))
+        return _history_messages(parsed_entries)
+
+    @classmethod
+    def _extend_message_log(cls, log: _MessageLog, content: bytes) -> _MessageLog:
+        """Return a new log with the complete lines in content parsed onto log."""
+        entries = log.held + cls._decode_entries(content)
+        # Hold back a trailing local command invoke: parse_entries names the
+        # next command output after it, and only skips non-message entries.
+        cut = len(entries)
+        for i in range(len(entries) - 1, -1, -1):
+            data = entries[i]
+            if TranscriptParser.get_message_type(data) not in (
+                "user",
+                "assistant",
+            ) or not isinstance(data.get("message"), dict):
+                continue
+            parsed = TranscriptParser.parse_message(data)
+            if parsed and parsed.message_type == "local_command_invoke":
+                cut = i
+            break
+        parsed_entries, pending = TranscriptParser.parse_entries(
+            entries[:cut], log.pending_tools
+        )
+        return _MessageLog(
+            offset=log.offset + len(content),
+            messages=log.messages + _history_messages(parsed_entries),
+            pending_tools=pending,
+            held=entries[cut:],
+        )
+
+    @staticmethod
+    def _decode_entries(content: bytes) -> list[dict]:
+        """Decode the non-empty JSON lines of content, skipping invalid ones."""
+        parse_line = TranscriptParser.parse_line
+        return [data for line in content.split(b"\n") if (data := parse_line(line))]
 
 
 session_manager = SessionManager()
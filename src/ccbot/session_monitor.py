@@ -7,27 +7,40 @@ Runs an async polling loop that:
   4. Parses entries via TranscriptParser and emits NewMessage objects to a callback.
 
 Optimizations: mtime cache skips unchanged files; byte offset avoids re-reading.
+With the optional watchfiles package, transcript writes wake the loop early.
 
 Key classes: SessionMonitor, NewMessage, SessionInfo.
 """
 
 import asyncio
-import json
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Awaitable
 
-import aiofiles
+import orjson
+
+try:
+    from watchfiles import awatch  # pyright: ignore[reportMissingImports]
+except ImportError:  # optional: pip install "ccbot[watch]"
+    awatch = None
 
 from .config import config
 from .monitor_state import MonitorState, TrackedSession
 from .tmux_manager import tmux_manager
 from .transcript_parser import TranscriptParser
-from .utils import read_cwd_from_jsonl
+from .utils import read_cwd_from_jsonl, read_file_range
 
 logger = logging.getLogger(__name__)
 
+# Max raw path -> resolved path entries kept across poll cycles
+_RESOLVE_CACHE_SIZE = 1024
+# Max session files read at once per poll (each read is a worker-thread call)
+_MAX_CONCURRENT_READS = 8
+# While messages keep arriving, poll this many times faster than configured
+_ACTIVE_POLL_SPEEDUP = 4
+
 
 @dataclass
 class SessionInfo:
@@ -35,6 +48,8 @@ class SessionInfo:
 
     session_id: str
     file_path: Path
+    # stat() taken while scanning, reused by check_for_updates
+    stat: os.stat_result | None = None
 
 
 @dataclass
@@ -54,7 +69,7 @@ class NewMessage:
 class SessionMonitor:
     """Monitors Claude Code sessions for new assistant messages.
 
-    Uses simple async polling with aiofiles for non-blocking I/O.
+    Uses simple async polling; file reads run in worker threads.
     Emits both intermediate and complete assistant messages.
     """
 
@@ -71,11 +86,18 @@ class SessionMonitor:
             poll_interval if poll_interval is not None else config.monitor_poll_interval
         )
 
+        # Sleep before the next poll: shortened while sessions are active,
+        # eased back to poll_interval once they go quiet
+        self._current_interval = self.poll_interval
+
         self.state = MonitorState(state_file=state_file or config.monitor_state_file)
         self.state.load()
 
         self._running = False
         self._task: asyncio.Task | None = None
+        # File-change watcher (watchfiles only) and the event it sets
+        self._watch_task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
         self._message_callback: Callable[[NewMessage], Awaitable[None]] | None = None
         # Per-session pending tool_use state carried across poll cycles
         self._pending_tools: dict[str, dict[str, Any]] = {}  # session_id -> pending
@@ -84,22 +106,74 @@ class SessionMonitor:
         self._last_session_map: dict[str, str] = {}  # window_key -> session_id
         # In-memory mtime cache for quick file change detection (not persisted)
         self._file_mtimes: dict[str, float] = {}  # session_id -> last_seen_mtime
+        # (st_mtime_ns, st_size, mapping) of the last parsed session_map.json
+        self._session_map_cache: tuple[int, int, dict[str, str]] | None = None
+        # Raw path -> resolved path, kept across polls; cleared whenever the
+        # session_map changes (insertion-ordered, oldest evicted first)
+        self._resolve_cache: dict[str, str] = {}
+
+    def _update_interval(self, active: bool) -> float:
+        """Adapt the poll interval to activity and return it.
+
+        A poll that found messages jumps to the fastest rate, since more
+        output usually follows; quiet polls back off by 1.5x per cycle but
+        never past poll_interval, so idle latency stays as configured.
+        """
+        if active:
+            self._current_interval = self.poll_interval / _ACTIVE_POLL_SPEEDUP
+        else:
+            self._current_interval = min(
+                self.poll_interval, self._current_interval * 1.5
+            )
+        return self._current_interval
 
     def set_message_callback(
         self, callback: Callable[[NewMessage], Awaitable[None]]
     ) -> None:
         self._message_callback = callback
 
+    def _normalize_path(self, path: str) -> str:
+        """Resolve path, memoized; unresolvable paths map to themselves.
+
+        Path.resolve() stats every component, and window cwds and index
+        entries repeat the same few paths every poll, so each distinct path
+        is resolved once until the cache is cleared.
+        """
+        cache = self._resolve_cache
+        norm = cache.get(path)
+        if norm is None:
+            try:
+                norm = str(Path(path).resolve())
+            except (OSError, ValueError):
+                norm = path
+            if len(cache) >= _RESOLVE_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[path] = norm
+        return norm
+
     async def _get_active_cwds(self) -> set[str]:
         """Get normalized cwds of all active tmux windows."""
-        cwds = set()
         windows = await tmux_manager.list_windows()
-        for w in windows:
-            try:
-                cwds.add(str(Path(w.cwd).resolve()))
-            except (OSError, ValueError):
-                cwds.add(w.cwd)
-        return cwds
+        return {self._normalize_path(w.cwd) for w in windows}
+
+    @staticmethod
+    def _stat_indexed(
+        file_path: Path,
+        project_dir: Path,
+        jsonl_entries: dict[str, os.DirEntry[str]],
+    ) -> os.stat_result | None:
+        """Stat an index entry's transcript, or None if it is missing.
+
+        Transcripts normally live in the project dir itself, where the
+        directory scan already produced a DirEntry with a cached stat.
+        """
+        try:
+            if file_path.parent == project_dir:
+                entry = jsonl_entries.get(file_path.name)
+                return entry.stat() if entry is not None else None
+            return file_path.stat()
+        except OSError:
+            return None
 
     async def scan_projects(self) -> list[SessionInfo]:
         """Scan projects that have active tmux windows."""
@@ -109,22 +183,38 @@ class SessionMonitor:
 
         sessions = []
 
-        if not self.projects_path.exists():
+        try:
+            with os.scandir(self.projects_path) as it:
+                project_dirs = [e for e in it if e.is_dir()]
+        except OSError:
             return sessions
 
-        for project_dir in self.projects_path.iterdir():
-            if not project_dir.is_dir():
+        for dir_entry in project_dirs:
+            project_dir = Path(dir_entry.path)
+
+            # One directory pass; DirEntry.is_file() needs no extra syscall
+            # and DirEntry.stat() is cached on the entry.
+            has_index = False
+            jsonl_entries: dict[str, os.DirEntry[str]] = {}
+            try:
+                with os.scandir(project_dir) as it:
+                    for entry in it:
+                        if entry.name == "sessions-index.json":
+                            has_index = entry.is_file()
+                        elif entry.name.endswith(".jsonl") and entry.is_file():
+                            jsonl_entries[entry.name] = entry
+            except OSError as e:
+                logger.debug("Error scanning jsonl files in %s: %s", project_dir, e)
                 continue
 
             index_file = project_dir / "sessions-index.json"
             original_path = ""
             indexed_ids: set[str] = set()
 
-            if index_file.exists():
+            if has_index:
                 try:
-                    async with aiofiles.open(index_file, "r") as f:
-                        content = await f.read()
-                    index_data = json.loads(content)
+                    content = await asyncio.to_thread(read_file_range, index_file)
+                    index_data = orjson.loads(content)
                     entries = index_data.get("entries", [])
                     original_path = index_data.get("originalPath", "")
 
@@ -136,60 +226,59 @@ class SessionMonitor:
                         if not session_id or not full_path:
                             continue
 
-                        try:
-                            norm_pp = str(Path(project_path).resolve())
-                        except (OSError, ValueError):
-                            norm_pp = project_path
+                        norm_pp = self._normalize_path(project_path)
                         if norm_pp not in active_cwds:
                             continue
 
                         indexed_ids.add(session_id)
                         file_path = Path(full_path)
-                        if file_path.exists():
+                        st = self._stat_indexed(file_path, project_dir, jsonl_entries)
+                        if st is not None:
                             sessions.append(
                                 SessionInfo(
                                     session_id=session_id,
                                     file_path=file_path,
+                                    stat=st,
                                 )
                             )
 
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.debug(f"Error reading index {index_file}: {e}")
+                except (orjson.JSONDecodeError, OSError) as e:
+                    logger.debug("Error reading index %s: %s", index_file, e)
 
             # Pick up un-indexed .jsonl files
-            try:
-                for jsonl_file in project_dir.glob("*.jsonl"):
-                    session_id = jsonl_file.stem
-                    if session_id in indexed_ids:
-                        continue
-
-                    # Determine project_path for this file
-                    file_project_path = original_path
-                    if not file_project_path:
-                        file_project_path = await asyncio.to_thread(
-                            read_cwd_from_jsonl, jsonl_file
-                        )
-                    if not file_project_path:
-                        dir_name = project_dir.name
-                        if dir_name.startswith("-"):
-                            file_project_path = dir_name.replace("-", "/")
-
-                    try:
-                        norm_fp = str(Path(file_project_path).resolve())
-                    except (OSError, ValueError):
-                        norm_fp = file_project_path
-
-                    if norm_fp not in active_cwds:
-                        continue
-
-                    sessions.append(
-                        SessionInfo(
-                            session_id=session_id,
-                            file_path=jsonl_file,
-                        )
+            for name, entry in jsonl_entries.items():
+                session_id = name[: -len(".jsonl")]
+                if session_id in indexed_ids:
+                    continue
+                jsonl_file = Path(entry.path)
+
+                # Determine project_path for this file
+                file_project_path = original_path
+                if not file_project_path:
+                    file_project_path = await asyncio.to_thread(
+                        read_cwd_from_jsonl, jsonl_file
                     )
-            except OSError as e:
-                logger.debug(f"Error scanning jsonl files in {project_dir}: {e}")
+                if not file_project_path:
+                    dir_name = project_dir.name
+                    if dir_name.startswith("-"):
+                        file_project_path = dir_name.replace("-", "/")
+
+                norm_fp = self._normalize_path(file_project_path)
+
+                if norm_fp not in active_cwds:
+                    continue
+
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                sessions.append(
+                    SessionInfo(
+                        session_id=session_id,
+                        file_path=jsonl_file,
+                        stat=st,
+                    )
+                )
 
         return sessions
 
@@ -200,176 +289,189 @@ class SessionMonitor:
 
         Detects file truncation (e.g. after /clear) and resets offset.
         Recovers from corrupted offsets (mid-line) by scanning to next line.
+        The new bytes are read in one call in a worker thread and split in
+        memory, rather than awaiting one file call per line.
         """
-        new_entries = []
+        new_entries: list[dict] = []
+        offset = session.last_byte_offset
         try:
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                # Get file size to detect truncation
-                await f.seek(0, 2)  # Seek to end
-                file_size = await f.tell()
-
-                # Detect file truncation: if offset is beyond file size, reset
-                if session.last_byte_offset > file_size:
-                    logger.info(
-                        "File truncated for session %s "
-                        "(offset %d > size %d). Resetting.",
-                        session.session_id,
-                        session.last_byte_offset,
-                        file_size,
-                    )
-                    session.last_byte_offset = 0
-
-                # Seek to last read position for incremental reading
-                await f.seek(session.last_byte_offset)
-
-                # Detect corrupted offset: if we're mid-line (not at '{'),
-                # scan forward to the next line start. This can happen if
-                # the state file was manually edited or corrupted.
-                if session.last_byte_offset > 0:
-                    first_char = await f.read(1)
-                    if first_char and first_char != "{":
-                        logger.warning(
-                            "Corrupted offset %d in session %s (mid-line), "
-                            "scanning to next line",
-                            session.last_byte_offset,
-                            session.session_id,
-                        )
-                        await f.readline()  # Skip rest of partial line
-                        session.last_byte_offset = await f.tell()
-                        return []
-                    await f.seek(session.last_byte_offset)  # Reset for normal read
-
-                # Read only new lines from the offset.
-                # Track safe_offset: only advance past lines that parsed
-                # successfully. A non-empty line that fails JSON parsing is
-                # likely a partial write; stop and retry next cycle.
-                safe_offset = session.last_byte_offset
-                async for line in f:
-                    data = TranscriptParser.parse_line(line)
-                    if data:
-                        new_entries.append(data)
-                        safe_offset = await f.tell()
-                    elif line.strip():
-                        # Partial JSONL line — don't advance offset past it
-                        logger.warning(
-                            "Partial JSONL line in session %s, will retry next cycle",
-                            session.session_id,
-                        )
-                        break
-                    else:
-                        # Empty line — safe to skip
-                        safe_offset = await f.tell()
-
-                session.last_byte_offset = safe_offset
+            file_size = file_path.stat().st_size
+
+            # Detect file truncation: if offset is beyond file size, reset
+            if offset > file_size:
+                logger.info(
+                    "File truncated for session %s (offset %d > size %d). Resetting.",
+                    session.session_id,
+                    offset,
+                    file_size,
+                )
+                offset = session.last_byte_offset = 0
 
+            data = await asyncio.to_thread(
+                read_file_range, file_path, offset, file_size
+            )
         except OSError as e:
             logger.error("Error reading session file %s: %s", file_path, e)
+            return new_entries
+
+        # Detect corrupted offset: if we're mid-line (not at '{'), skip to
+        # the next line start. This can happen if the state file was
+        # manually edited or corrupted.
+        if offset > 0 and data and data[:1] != b"{":
+            logger.warning(
+                "Corrupted offset %d in session %s (mid-line), scanning to next line",
+                offset,
+                session.session_id,
+            )
+            nl = data.find(b"\n")
+            session.last_byte_offset = offset + (nl + 1 if nl >= 0 else len(data))
+            return new_entries
+
+        # Track safe_offset: only advance past lines that are done with.
+        # An unterminated last line that fails JSON parsing is a partial
+        # write; stop and retry it next cycle. A newline-terminated line
+        # that fails is corrupt and will never parse, so skip it rather
+        # than stalling the session on it forever.
+        safe_offset = offset
+        for line in data.splitlines(keepends=True):
+            entry = TranscriptParser.parse_line(line)
+            if entry:
+                new_entries.append(entry)
+            elif line.strip():
+                if not line.endswith(b"\n"):
+                    # Partial JSONL line — don't advance offset past it
+                    logger.warning(
+                        "Partial JSONL line in session %s, will retry next cycle",
+                        session.session_id,
+                    )
+                    break
+                logger.warning(
+                    "Skipping unparseable JSONL line at offset %d in session %s",
+                    safe_offset,
+                    session.session_id,
+                )
+            # Parsed, empty or corrupt line — safe to advance past it
+            safe_offset += len(line)
+
+        session.last_byte_offset = safe_offset
         return new_entries
 
     async def check_for_updates(self, active_session_ids: set[str]) -> list[NewMessage]:
         """Check all sessions for new assistant messages.
 
         Reads from last byte offset. Emits both intermediate
-        (stop_reason=null) and complete messages.
+        (stop_reason=null) and complete messages. Changed sessions are
+        read concurrently (at most _MAX_CONCURRENT_READS at a time); the
+        result keeps scan order.
 
         Args:
             active_session_ids: Set of session IDs currently in session_map
         """
-        new_messages = []
-
         # Scan projects to get available session files
         sessions = await self.scan_projects()
 
-        # Only process sessions that are in session_map
+        # Only process sessions that are in session_map, each once
+        selected: dict[str, SessionInfo] = {}
         for session_info in sessions:
-            if session_info.session_id not in active_session_ids:
-                continue
-            try:
-                tracked = self.state.get_session(session_info.session_id)
-
-                if tracked is None:
-                    # For new sessions, initialize offset to end of file
-                    # to avoid re-processing old messages
-                    try:
-                        file_size = session_info.file_path.stat().st_size
-                        current_mtime = session_info.file_path.stat().st_mtime
-                    except OSError:
-                        file_size = 0
-                        current_mtime = 0.0
-                    tracked = TrackedSession(
-                        session_id=session_info.session_id,
-                        file_path=str(session_info.file_path),
-                        last_byte_offset=file_size,
-                    )
-                    self.state.update_session(tracked)
-                    self._file_mtimes[session_info.session_id] = current_mtime
-                    logger.info(f"Started tracking session: {session_info.session_id}")
-                    continue
+            if session_info.session_id in active_session_ids:
+                selected.setdefault(session_info.session_id, session_info)
 
-                # Check mtime + file size to see if file has changed
-                try:
-                    st = session_info.file_path.stat()
-                    current_mtime = st.st_mtime
-                    current_size = st.st_size
-                except OSError:
-                    continue
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_READS)
 
-                last_mtime = self._file_mtimes.get(session_info.session_id, 0.0)
-                if (
-                    current_mtime <= last_mtime
-                    and current_size <= tracked.last_byte_offset
-                ):
-                    # File hasn't changed, skip reading
-                    continue
+        async def bounded(info: SessionInfo) -> list[NewMessage]:
+            async with sem:
+                return await self._process_session(info)
 
-                # File changed, read new content from last offset
-                new_entries = await self._read_new_lines(
-                    tracked, session_info.file_path
-                )
-                self._file_mtimes[session_info.session_id] = current_mtime
+        results = await asyncio.gather(*(bounded(i) for i in selected.values()))
 
-                if new_entries:
-                    logger.debug(
-                        f"Read {len(new_entries)} new entries for "
-                        f"session {session_info.session_id}"
-                    )
+        self.state.save_if_dirty()
+        return [msg for msgs in results for msg in msgs]
 
-                # Parse new entries using the shared logic, carrying over pending tools
-                carry = self._pending_tools.get(session_info.session_id, {})
-                parsed_entries, remaining = TranscriptParser.parse_entries(
-                    new_entries,
-                    pending_tools=carry,
+    async def _process_session(self, info: SessionInfo) -> list[NewMessage]:
+        """Read and parse new entries of one session file."""
+        new_messages: list[NewMessage] = []
+        try:
+            tracked = self.state.get_session(info.session_id)
+
+            st = info.stat
+            if st is None:
+                try:
+                    st = info.file_path.stat()
+                except OSError:
+                    st = None
+
+            if tracked is None:
+                # For new sessions, initialize offset to end of file
+                # to avoid re-processing old messages
+                file_size = st.st_size if st is not None else 0
+                current_mtime = st.st_mtime if st is not None else 0.0
+                tracked = TrackedSession(
+                    session_id=info.session_id,
+                    file_path=str(info.file_path),
+                    last_byte_offset=file_size,
+                )
+                self.state.update_session(tracked)
+                self._file_mtimes[info.session_id] = current_mtime
+                logger.info(f"Started tracking session: {info.session_id}")
+                return new_messages
+
+            # Check mtime + file size to see if file has changed
+            if st is None:
+                return new_messages
+            current_mtime = st.st_mtime
+            current_size = st.st_size
+
+            last_mtime = self._file_mtimes.get(info.session_id, 0.0)
+            if current_mtime <= last_mtime and current_size <= tracked.last_byte_offset:
+                # File hasn't changed, skip reading
+                return new_messages
+
+            # File changed, read new content from last offset
+            new_entries = await self._read_new_lines(tracked, info.file_path)
+            self._file_mtimes[info.session_id] = current_mtime
+
+            if new_entries:
+                logger.debug(
+                    "Read %d new entries for session %s",
+                    len(new_entries),
+                    info.session_id,
                 )
-                if remaining:
-                    self._pending_tools[session_info.session_id] = remaining
-                else:
-                    self._pending_tools.pop(session_info.session_id, None)
-
-                for entry in parsed_entries:
-                    if not entry.text and not entry.image_data:
-                        continue
-                    # Skip user messages unless show_user_messages is enabled
-                    if entry.role == "user" and not config.show_user_messages:
-                        continue
-                    new_messages.append(
-                        NewMessage(
-                            session_id=session_info.session_id,
-                            text=entry.text,
-                            is_complete=True,
-                            content_type=entry.content_type,
-                            tool_use_id=entry.tool_use_id,
-                            role=entry.role,
-                            tool_name=entry.tool_name,
-                            image_data=entry.image_data,
-                        )
+
+            # Parse new entries using the shared logic, carrying over pending tools
+            carry = self._pending_tools.get(info.session_id, {})
+            parsed_entries, remaining = TranscriptParser.parse_entries(
+                new_entries,
+                pending_tools=carry,
+            )
+            if remaining:
+                self._pending_tools[info.session_id] = remaining
+            else:
+                self._pending_tools.pop(info.session_id, None)
+
+            for entry in parsed_entries:
+                if not entry.text and not entry.image_data:
+                    continue
+                # Skip user messages unless show_user_messages is enabled
+                if entry.role == "user" and not config.show_user_messages:
+                    continue
+                new_messages.append(
+                    NewMessage(
+                        session_id=info.session_id,
+                        text=entry.text,
+                        is_complete=True,
+                        content_type=entry.content_type,
+                        tool_use_id=entry.tool_use_id,
+                        role=entry.role,
+                        tool_name=entry.tool_name,
+                        image_data=entry.image_data,
                     )
+                )
 
-                self.state.update_session(tracked)
+            self.state.update_session(tracked)
 
-            except OSError as e:
-                logger.debug(f"Error processing session {session_info.session_id}: {e}")
+        except OSError as e:
+            logger.debug(f"Error processing session {info.session_id}: {e}")
 
-        self.state.save_if_dirty()
         return new_messages
 
     async def _load_current_session_map(self) -> dict[str, str]:
@@ -380,30 +482,43 @@ class SessionMonitor:
         accepted so that sessions running before a code upgrade continue
         to be monitored until the hook re-fires with new format.
         Only entries matching our tmux_session_name are processed.
+
+        The hook replaces the file atomically, so an unchanged (mtime, size)
+        returns the previous mapping object without re-reading the file;
+        callers must not mutate it.
         """
+        try:
+            st = config.session_map_file.stat()
+        except OSError:
+            self._session_map_cache = None
+            return {}
+        cached = self._session_map_cache
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
         window_to_session: dict[str, str] = {}
-        if config.session_map_file.exists():
-            try:
-                async with aiofiles.open(config.session_map_file, "r") as f:
-                    content = await f.read()
-                session_map = json.loads(content)
-                prefix = f"{config.tmux_session_name}:"
-                for key, info in session_map.items():
-                    # Only process entries for our tmux session
-                    if not key.startswith(prefix):
-                        continue
-                    window_key = key[len(prefix) :]
-                    session_id = info.get("session_id", "")
-                    if session_id:
-                        window_to_session[window_key] = session_id
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            content = await asyncio.to_thread(read_file_range, config.session_map_file)
+            session_map = orjson.loads(content)
+            prefix = f"{config.tmux_session_name}:"
+            prefix_len = len(prefix)
+            for key, info in session_map.items():
+                # Only process entries for our tmux session
+                if not key.startswith(prefix):
+                    continue
+                window_key = key[prefix_len:]
+                session_id = info.get("session_id", "")
+                if session_id:
+                    window_to_session[window_key] = session_id
+        except (orjson.JSONDecodeError, OSError):
+            return window_to_session
+        self._session_map_cache = (st.st_mtime_ns, st.st_size, window_to_session)
         return window_to_session
 
     async def _cleanup_all_stale_sessions(self) -> None:
         """Clean up all tracked sessions not in current session_map (used on startup)."""
         current_map = await self._load_current_session_map()
         active_session_ids = set(current_map.values())
+        self._resolve_cache.clear()
 
         stale_sessions = []
         for session_id in self.state.tracked_sessions.keys():
@@ -425,6 +540,10 @@ class SessionMonitor:
         Returns current session_map for further processing.
         """
         current_map = await self._load_current_session_map()
+        if current_map is self._last_session_map:
+            return current_map
+        # Windows came or went: drop resolved paths that may be stale
+        self._resolve_cache.clear()
 
         sessions_to_remove: set[str] = set()
 
@@ -466,16 +585,46 @@ class SessionMonitor:
 
         return current_map
 
+    async def _watch_projects(self) -> None:
+        """Set the wake event whenever a transcript under projects_path changes.
+
+        Events only cut the sleep short; the poll still decides what to read,
+        so a missed or coalesced event costs at most one interval.
+        """
+        if awatch is None:
+            return
+        try:
+            async for _ in awatch(
+                self.projects_path,
+                watch_filter=lambda _change, path: path.endswith(".jsonl"),
+            ):
+                self._wake.set()
+        except Exception as e:
+            logger.warning("File watching unavailable, polling only: %s", e)
+
+    async def _sleep(self) -> None:
+        """Sleep for the current interval, or until the watcher wakes us."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), self._current_interval)
+        except TimeoutError:
+            pass
+        self._wake.clear()
+
     async def _monitor_loop(self) -> None:
         """Background loop for checking session updates.
 
-        Uses simple async polling with aiofiles for non-blocking I/O.
+        Uses simple async polling; file reads run in worker threads. The
+        interval shortens while messages arrive (see _update_interval), and
+        with watchfiles installed a transcript write ends the sleep early.
         """
         logger.info("Session monitor started, polling every %ss", self.poll_interval)
 
         # Deferred import to avoid circular dependency (cached once)
         from .session import session_manager
 
+        if awatch is not None and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_projects())
+
         # Clean up all stale sessions on startup
         await self._cleanup_all_stale_sessions()
         # Initialize last known session_map
@@ -492,6 +641,7 @@ class SessionMonitor:
 
                 # Check for new messages (all I/O is async)
                 new_messages = await self.check_for_updates(active_session_ids)
+                self._update_interval(bool(new_messages))
 
                 for msg in new_messages:
                     status = "complete" if msg.is_complete else "streaming"
@@ -506,7 +656,7 @@ class SessionMonitor:
             except Exception as e:
                 logger.error(f"Monitor loop error: {e}")
 
-            await asyncio.sleep(self.poll_interval)
+            await self._sleep()
 
         logger.info("Session monitor stopped")
 
@@ -522,5 +672,8 @@ class SessionMonitor:
         if self._task:
             self._task.cancel()
             self._task = None
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
         self.state.save()
         logger.info("Session monitor stopped and state saved")
@@ -19,25 +19,28 @@ def split_message(
         return [text]
 
     chunks = []
-    current_chunk = ""
+    # Lines of the current chunk; chunk_len counts each with its newline
+    current: list[str] = []
+    chunk_len = 0
 
     for line in text.split("\n"):
         # If single line exceeds max, split it forcefully
         if len(line) > max_length:
-            if current_chunk:
-                chunks.append(current_chunk.rstrip("\n"))
-                current_chunk = ""
+            if current:
+                chunks.append("\n".join(current).rstrip("\n"))
+                current, chunk_len = [], 0
             # Split long line into fixed-size pieces
             for i in range(0, len(line), max_length):
                 chunks.append(line[i : i + max_length])
-        elif len(current_chunk) + len(line) + 1 > max_length:
+        elif chunk_len + len(line) + 1 > max_length:
             # Current chunk is full, start a new one
-            chunks.append(current_chunk.rstrip("\n"))
-            current_chunk = line + "\n"
+            chunks.append("\n".join(current).rstrip("\n"))
+            current, chunk_len = [line], len(line) + 1
         else:
-            current_chunk += line + "\n"
+            current.append(line)
+            chunk_len += len(line) + 1
 
-    if current_chunk:
-        chunks.append(current_chunk.rstrip("\n"))
+    if current:
+        chunks.append("\n".join(current).rstrip("\n"))
 
     return chunks
@@ -13,12 +13,13 @@ Key classes: TranscriptParser (static methods), ParsedEntry, ParsedMessage, Pend
 
 import base64
 import difflib
-import json
 import logging
 import re
 from dataclasses import dataclass
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,22 +78,24 @@ class TranscriptParser:
     _MAX_SUMMARY_LENGTH = 200
 
     @staticmethod
-    def parse_line(line: str) -> dict | None:
+    def parse_line(line: str | bytes) -> dict | None:
         """Parse a single JSONL line.
 
         Args:
-            line: A single line from the JSONL file
+            line: A single line from the JSONL file, as read (bytes are
+                decoded by orjson directly, skipping a UTF-8 decode)
 
         Returns:
             Parsed dict or None if line is empty/invalid
         """
-        line = line.strip()
-        if not line:
+        # orjson skips surrounding JSON whitespace itself; strip() would
+        # copy the whole (possibly very large) line first
+        if not line or line.isspace():
             return None
 
         try:
-            return json.loads(line)
-        except json.JSONDecodeError:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
             return None
 
     @staticmethod
@@ -408,6 +411,21 @@ class TranscriptParser:
         # Default: expandable quote without stats
         return cls._format_expandable_quote(text)
 
+    @staticmethod
+    def pending_tool_entries(
+        pending_tools: dict[str, PendingToolInfo],
+    ) -> list[ParsedEntry]:
+        """Entries for tool_use blocks that never got a tool_result."""
+        return [
+            ParsedEntry(
+                role="assistant",
+                text=tool_info.summary.strip(),
+                content_type="tool_use",
+                tool_use_id=tool_id,
+            )
+            for tool_id, tool_info in pending_tools.items()
+        ]
+
     @classmethod
     def parse_entries(
         cls,
@@ -745,15 +763,7 @@ class TranscriptParser:
         # without emitting entries. In one-shot mode (history), emit them.
         remaining_pending = dict(pending_tools)
         if not _carry_over:
-            for tool_id, tool_info in pending_tools.items():
-                result.append(
-                    ParsedEntry(
-                        role="assistant",
-                        text=tool_info.summary,
-                        content_type="tool_use",
-                        tool_use_id=tool_id,
-                    )
-                )
+            result.extend(cls.pending_tool_entries(pending_tools))
 
         # Strip whitespace
         for entry in result:
@@ -2,16 +2,23 @@
 
 Provides:
   - ccbot_dir(): resolve config directory from CCBOT_DIR env var.
-  - atomic_write_json(): crash-safe JSON file writes via temp+rename.
+  - atomic_write_bytes(): crash-safe file writes via temp+rename.
+  - atomic_write_json(): atomic_write_bytes() for orjson-encoded data.
+  - read_file_range(): read a byte range of a file in one call.
   - read_cwd_from_jsonl(): extract the cwd field from the first JSONL entry.
 """
 
-import json
 import os
 import tempfile
 from pathlib import Path
 from typing import Any
 
+import orjson
+
+# fdatasync skips flushing metadata (e.g. mtime) that is not needed to read
+# the data back; platforms without it (macOS) fall back to fsync.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
 CCBOT_DIR_ENV = "CCBOT_DIR"
 
 
@@ -27,19 +34,31 @@ def atomic_write_json(path: Path, data: Any, indent: int = 2) -> None:
     Writes to a temporary file in the same directory, then renames it
     to the target path. This prevents data corruption if the process
     is interrupted mid-write.
+
+    Encoded with orjson as UTF-8; it only supports two-space indentation,
+    so any non-zero indent is pretty-printed and indent=0 is compact.
+    Non-string dict keys (e.g. int user IDs) are written as strings, as
+    the json module does.
     """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    atomic_write_bytes(path, orjson.dumps(data, option=option))
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """Write bytes to a file atomically (temp file in the same dir + rename)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    content = json.dumps(data, indent=indent)
 
     # Write to temp file in same directory (same filesystem for atomic rename)
     fd, tmp_path = tempfile.mkstemp(
         dir=str(path.parent), suffix=".tmp", prefix=f".{path.name}."
     )
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
+        with os.fdopen(fd, "wb") as f:
             f.write(content)
             f.flush()
-            os.fsync(f.fileno())
+            _fdatasync(f.fileno())
         os.replace(tmp_path, str(path))
     except BaseException:
         try:
@@ -49,23 +68,35 @@ def atomic_write_json(path: Path, data: Any, indent: int = 2) -> None:
         raise
 
 
+def read_file_range(path: str | Path, start: int = 0, end: int | None = None) -> bytes:
+    """Read bytes [start, end) of a file, or to EOF when end is None.
+
+    Meant for asyncio.to_thread: one blocking read is much cheaper than
+    awaiting an async file call per line.
+    """
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start)
+        return f.read() if end is None else f.read(max(0, end - start))
+
+
 def read_cwd_from_jsonl(file_path: str | Path) -> str:
     """Read the cwd field from the first JSONL entry that has one.
 
     Shared by session.py and session_monitor.py.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(file_path, "rb") as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     cwd = data.get("cwd")
                     if cwd:
                         return cwd
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     continue
     except OSError:
         pass
@@ -31,6 +31,11 @@ class TestConfigValid:
         cfg = Config()
         assert cfg.monitor_poll_interval == 5.0
 
+    def test_recent_messages_tail_bytes(self, monkeypatch):
+        assert Config().recent_messages_tail_bytes == 0
+        monkeypatch.setenv("RECENT_MESSAGES_TAIL_BYTES", "4096")
+        assert Config().recent_messages_tail_bytes == 4096
+
     def test_is_user_allowed_true(self):
         cfg = Config()
         assert cfg.is_user_allowed(12345) is True
@@ -0,0 +1,221 @@
+"""Tests for screenshot — ANSI parsing, palette lookup, and PNG rendering."""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from ccbot import screenshot
+from ccbot.screenshot import (
+    _ANSI_COLORS,
+    _DEFAULT_BG,
+    _DEFAULT_FG,
+    _PALETTE_256,
+    TextStyle,
+    _apply_ansi_codes,
+    _parse_ansi_line,
+    shutdown_render_pool,
+    text_to_image,
+)
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+# ── 256-color palette ────────────────────────────────────────────────────
+
+
+class TestPalette256:
+    def test_has_256_entries(self):
+        assert len(_PALETTE_256) == 256
+
+    def test_first_16_match_basic_colors(self):
+        for idx in range(16):
+            assert _PALETTE_256[idx] == _ANSI_COLORS[idx]
+
+    @pytest.mark.parametrize(
+        ("idx", "expected"),
+        [
+            (16, (0, 0, 0)),
+            (21, (0, 0, 255)),
+            (196, (255, 0, 0)),
+            (231, (255, 255, 255)),
+            (232, (8, 8, 8)),
+            (255, (238, 238, 238)),
+        ],
+    )
+    def test_cube_and_grayscale(self, idx: int, expected: tuple[int, int, int]):
+        assert _PALETTE_256[idx] == expected
+
+
+# ── _apply_ansi_codes ────────────────────────────────────────────────────
+
+
+class TestApplyAnsiCodes:
+    @pytest.mark.parametrize(
+        ("codes", "fg", "bg"),
+        [
+            pytest.param("31", _ANSI_COLORS[1], None, id="basic_fg"),
+            pytest.param("44", _DEFAULT_FG, _ANSI_COLORS[4], id="basic_bg"),
+            pytest.param("92", _ANSI_COLORS[10], None, id="bright_fg"),
+            pytest.param("103", _DEFAULT_FG, _ANSI_COLORS[11], id="bright_bg"),
+            pytest.param("38;5;196", (255, 0, 0), None, id="fg_256"),
+            pytest.param("48;5;232", _DEFAULT_FG, (8, 8, 8), id="bg_256"),
+            pytest.param("38;2;1;2;3", (1, 2, 3), None, id="fg_rgb"),
+            pytest.param("48;2;4;5;6", _DEFAULT_FG, (4, 5, 6), id="bg_rgb"),
+            pytest.param("31;0", _DEFAULT_FG, None, id="reset"),
+            pytest.param("1;32", _ANSI_COLORS[2], None, id="bold_ignored"),
+        ],
+    )
+    def test_codes(self, codes: str, fg: tuple, bg: tuple | None):
+        style = _apply_ansi_codes(TextStyle(), codes)
+        assert style.fg_color == fg
+        assert style.bg_color == bg
+
+    def test_default_fg_and_bg(self):
+        style = TextStyle(fg_color=(1, 1, 1), bg_color=(2, 2, 2))
+        style = _apply_ansi_codes(style, "39;49")
+        assert style.fg_color == _DEFAULT_FG
+        assert style.bg_color is None
+
+    def test_empty_params_skipped(self):
+        style = _apply_ansi_codes(TextStyle(), "38;;5;;196")
+        assert style.fg_color == (255, 0, 0)
+
+    def test_unchanged_style_is_reused(self):
+        style = TextStyle(fg_color=_ANSI_COLORS[1])
+        assert _apply_ansi_codes(style, "31;1") is style
+
+    def test_reset_returns_shared_default(self):
+        style = TextStyle(fg_color=_ANSI_COLORS[1])
+        assert _apply_ansi_codes(style, "0") is _apply_ansi_codes(style, "39;49")
+
+    def test_truncated_extended_code_ignored(self):
+        style = _apply_ansi_codes(TextStyle(), "38;5")
+        assert style.fg_color == _DEFAULT_FG
+
+
+# ── _parse_ansi_line ─────────────────────────────────────────────────────
+
+
+class TestParseAnsiLine:
+    def test_plain_text(self):
+        segments = _parse_ansi_line("hello")
+        assert [s.text for s in segments] == ["hello"]
+        assert segments[0].style.fg_color == _DEFAULT_FG
+
+    def test_empty_line(self):
+        segments = _parse_ansi_line("")
+        assert len(segments) == 1
+        assert segments[0].text == ""
+
+    def test_colored_segments(self):
+        segments = _parse_ansi_line("a\x1b[31mb\x1b[0mc")
+        assert [s.text for s in segments] == ["a", "b", "c"]
+        assert segments[1].style.fg_color == _ANSI_COLORS[1]
+        assert segments[2].style.fg_color == _DEFAULT_FG
+
+    def test_empty_code_resets(self):
+        segments = _parse_ansi_line("\x1b[31ma\x1b[mb")
+        assert segments[1].style.fg_color == _DEFAULT_FG
+
+    def test_splits_by_font_tier(self):
+        segments = _parse_ansi_line("ab中文✔")
+        assert [(s.text, s.font_tier) for s in segments] == [
+            ("ab", 0),
+            ("中文", 1),
+            ("✔", 2),
+        ]
+
+    def test_non_sgr_escape_kept_as_text(self):
+        segments = _parse_ansi_line("a\x1b[2Kb\x1b[32mc")
+        assert [s.text for s in segments] == ["a\x1b[2Kb", "c"]
+        assert segments[1].style.fg_color == _ANSI_COLORS[2]
+
+    def test_unterminated_escape_kept_as_text(self):
+        segments = _parse_ansi_line("a\x1b[31")
+        assert [s.text for s in segments] == ["a\x1b[31"]
+
+
+# ── text_to_image ────────────────────────────────────────────────────────
+
+
+class TestTextToImage:
+    async def test_returns_png(self):
+        png = await text_to_image("hello \x1b[31mworld\x1b[0m\n中文 ✔")
+        assert png.startswith(PNG_MAGIC)
+
+    async def test_plain_mode_returns_paletted_png(self):
+        png = await text_to_image("hello\nworld", with_ansi=False)
+        assert png.startswith(PNG_MAGIC)
+        img = Image.open(io.BytesIO(png))
+        assert img.mode == "P"
+        assert img.convert("RGB").getpixel((0, 0)) == _DEFAULT_BG
+
+    async def test_monospace_runs_use_cell_width(self):
+        """Box-drawing glyphs overhang their cells but must not widen the row."""
+        box = Image.open(io.BytesIO(await text_to_image("────x")))
+        ascii_ = Image.open(io.BytesIO(await text_to_image("abcdx")))
+        assert box.size == ascii_.size
+
+    async def test_trailing_newline_adds_no_row(self):
+        assert await text_to_image("a\nb\n") == await text_to_image("a\nb")
+
+    async def test_empty_text_renders(self):
+        png = await text_to_image("")
+        assert png.startswith(PNG_MAGIC)
+
+    async def test_tall_text_truncated_to_pixel_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(screenshot, "_MAX_PIXELS", 200 * 500)
+        png = await text_to_image("\n".join("row" for _ in range(100)))
+        img = Image.open(io.BytesIO(png))
+        assert img.width * img.height <= 200 * 500
+        assert img.height > 39
+
+    @pytest.mark.parametrize("line", ["x" * 100, "中文" * 50, "ab中" * 40])
+    async def test_too_wide_line_cropped(
+        self, monkeypatch: pytest.MonkeyPatch, line: str
+    ):
+        monkeypatch.setattr(screenshot, "_MAX_PIXELS", 200 * 500)
+        png = await text_to_image(f"{line}\nok")
+        img = Image.open(io.BytesIO(png))
+        assert img.width * img.height <= 200 * 500
+        assert img.width > 100
+
+    def test_band_pool_created_once_under_concurrency(self):
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            pools = list(ex.map(lambda _: screenshot._get_band_pool(), range(32)))
+        try:
+            assert all(p is pools[0] for p in pools)
+        finally:
+            shutdown_render_pool()
+
+    async def test_compress_level_changes_size_not_pixels(self):
+        text = "\n".join(f"line {i} \x1b[3{i % 8}mcolored\x1b[0m" for i in range(20))
+        fast = await text_to_image(text, compress_level=1)
+        small = await text_to_image(text, compress_level=9)
+        assert len(small) <= len(fast)
+        fast_img = Image.open(io.BytesIO(fast))
+        small_img = Image.open(io.BytesIO(small))
+        assert fast_img.tobytes() == small_img.tobytes()
+
+    @pytest.mark.parametrize("with_ansi", [True, False])
+    async def test_parallel_bands_match_serial_render(
+        self, monkeypatch: pytest.MonkeyPatch, with_ansi: bool
+    ):
+        """Glyphs overhanging a band boundary are painted in serial order."""
+        text = "\n".join(
+            f"\x1b[4{i % 8}m\x1b[3{(i + 3) % 8}m│ gjpqy ┼─┤ {i} 中文\x1b[0m ▌█ gy"
+            for i in range(40)
+        )
+        serial = Image.open(io.BytesIO(await text_to_image(text, with_ansi=with_ansi)))
+        monkeypatch.setattr(screenshot, "_BAND_THREADS", 4)
+        monkeypatch.setattr(screenshot, "_MIN_BAND_LINES", 2)
+        try:
+            png = await text_to_image(text, with_ansi=with_ansi)
+        finally:
+            shutdown_render_pool()
+        banded = Image.open(io.BytesIO(png))
+        assert banded.size == serial.size
+        assert banded.tobytes() == serial.tobytes()
@@ -1,14 +1,25 @@
-"""Tests for SessionManager pure dict operations."""
+"""Tests for SessionManager state, persistence, and transcript scanning."""
 
+import asyncio
+import json
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
 import pytest
 
-from ccbot.session import SessionManager
+from ccbot import session as session_module
+from ccbot.config import config
+from ccbot.session import SessionManager, WindowState
+from ccbot.tmux_manager import tmux_manager
+from ccbot.transcript_parser import TranscriptParser
 
 
 @pytest.fixture
 def mgr(monkeypatch) -> SessionManager:
     monkeypatch.setattr(SessionManager, "_load_state", lambda self: None)
-    monkeypatch.setattr(SessionManager, "_save_state", lambda self: None)
+    monkeypatch.setattr(SessionManager, "_write_state", lambda self, content: None)
     return SessionManager()
 
 
@@ -32,6 +43,29 @@ class TestThreadBindings:
         result = set(mgr.iter_thread_bindings())
         assert result == {(100, 1, "@1"), (100, 2, "@2"), (200, 3, "@3")}
 
+    def test_iter_thread_bindings_is_snapshot(self, mgr: SessionManager) -> None:
+        mgr.bind_thread(100, 1, "@1")
+        mgr.bind_thread(100, 2, "@2")
+        seen = []
+        for user_id, thread_id, wid in mgr.iter_thread_bindings():
+            mgr.unbind_thread(user_id, thread_id)
+            seen.append(wid)
+        assert seen == ["@1", "@2"]
+        assert list(mgr.iter_thread_bindings()) == []
+
+    def test_persisted_round_trip(self, tmp_path: Path, monkeypatch) -> None:
+        state_file = tmp_path / "state.json"
+        monkeypatch.setattr(config, "state_file", state_file)
+        saved = SessionManager()
+        saved.bind_thread(100, 1, "@1", window_name="proj")
+        saved.update_user_window_offset(100, "@1", 42)
+        on_disk = json.loads(state_file.read_text())
+        assert on_disk["thread_bindings"] == {"100": {"1": "@1"}}
+        assert on_disk["user_window_offsets"] == {"100": {"@1": 42}}
+        loaded = SessionManager()
+        assert loaded.thread_bindings == {(100, 1): "@1"}
+        assert loaded.user_window_offsets == {(100, "@1"): 42}
+
 
 class TestGroupChatId:
     """Tests for group chat_id routing (supergroup forum topic support).
@@ -86,8 +120,21 @@ class TestGroupChatId:
         mgr.set_group_chat_id(100, None, -999)
         # thread_id=None in resolve falls back to user_id (by design)
         assert mgr.resolve_chat_id(100, None) == 100
-        # The stored key is "100:0", only accessible with explicit thread_id=0
-        assert mgr.group_chat_ids.get("100:0") == -999
+        # The stored key is (100, 0), only accessible with explicit thread_id=0
+        assert mgr.group_chat_ids.get((100, 0)) == -999
+        assert mgr.resolve_chat_id(100, 0) == -999
+
+    def test_persisted_with_string_keys(self, mgr: SessionManager) -> None:
+        """On-disk format stays "user_id:thread_id" for compatibility."""
+        mgr.set_group_chat_id(100, 1, -111)
+        state = json.loads(mgr._encode_state(mgr._snapshot_sections()))
+        assert state["group_chat_ids"] == {"100:1": -111}
+
+    def test_loaded_from_string_keys(self, tmp_path: Path, monkeypatch) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(json.dumps({"group_chat_ids": {"100:1": -111, "x": 5}}))
+        monkeypatch.setattr(config, "state_file", state_file)
+        assert SessionManager().group_chat_ids == {(100, 1): -111}
 
 
 class TestWindowState:
@@ -107,6 +154,30 @@ class TestWindowState:
         mgr.clear_window_session("@1")
         assert mgr.get_window_state("@1").session_id == ""
 
+    def test_loaded_window_ids_are_shared(self, tmp_path: Path, monkeypatch) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(
+            json.dumps(
+                {
+                    "window_states": {"@12": {"session_id": "a", "cwd": "/p"}},
+                    "thread_bindings": {"100": {"1": "@12"}},
+                    "user_window_offsets": {"100": {"@12": 5}},
+                }
+            )
+        )
+        monkeypatch.setattr(config, "state_file", state_file)
+        loaded = SessionManager()
+        (wid,) = loaded.window_states
+        assert loaded.thread_bindings[(100, 1)] is wid
+        assert next(iter(loaded.user_window_offsets))[1] is wid
+
+    def test_legacy_scan_key_dropped(self) -> None:
+        data = {"session_id": "a", "cwd": "/p", "scan": {"offset": 10}}
+        assert WindowState.from_dict(data).to_dict() == {
+            "session_id": "a",
+            "cwd": "/p",
+        }
+
 
 class TestResolveWindowForThread:
     def test_none_thread_id_returns_none(self, mgr: SessionManager) -> None:
@@ -155,3 +226,654 @@ class TestIsWindowId:
         assert mgr._is_window_id("@") is False
         assert mgr._is_window_id("") is False
         assert mgr._is_window_id("@abc") is False
+        assert mgr._is_window_id("@12\n") is False
+        assert mgr._is_window_id("x@12") is False
+
+    @pytest.mark.parametrize(
+        ("state", "detected"),
+        [
+            (
+                {"window_states": {"@1": {}}, "thread_bindings": {"1": {"2": "@1"}}},
+                False,
+            ),
+            ({"window_states": {"legacy": {}}}, True),
+            ({"thread_bindings": {"1": {"2": "@1", "3": "legacy"}}}, True),
+        ],
+    )
+    def test_old_format_state_detected(
+        self, tmp_path: Path, monkeypatch, caplog, state: dict, detected: bool
+    ) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(json.dumps(state))
+        monkeypatch.setattr(config, "state_file", state_file)
+        with caplog.at_level("INFO", logger="ccbot.session"):
+            SessionManager()
+        assert ("Detected old-format state" in caplog.text) is detected
+
+
+class TestDebouncedSave:
+    @pytest.fixture
+    def saves(self, monkeypatch) -> list[int]:
+        calls: list[int] = []
+        monkeypatch.setattr(
+            SessionManager, "_write_state", lambda self, content: calls.append(1)
+        )
+        return calls
+
+    def test_saves_immediately_without_event_loop(
+        self, mgr: SessionManager, saves: list[int]
+    ) -> None:
+        mgr.bind_thread(100, 1, "@1")
+        assert saves == [1]
+
+    async def test_burst_coalesced_into_one_write(
+        self, mgr: SessionManager, saves: list[int]
+    ) -> None:
+        mgr._flush_delay = 0.01
+        for tid in range(10):
+            mgr.bind_thread(100, tid, f"@{tid}")
+        assert saves == []
+        await asyncio.sleep(0.05)
+        assert saves == [1]
+
+    def test_unchanged_offset_and_binding_not_saved(
+        self, mgr: SessionManager, saves: list[int]
+    ) -> None:
+        mgr.bind_thread(100, 1, "@1", window_name="proj")
+        mgr.update_user_window_offset(100, "@1", 5)
+        assert saves == [1, 1]
+        mgr.bind_thread(100, 1, "@1", window_name="proj")
+        mgr.bind_thread(100, 1, "@1")
+        mgr.update_user_window_offset(100, "@1", 5)
+        assert saves == [1, 1]
+        mgr.bind_thread(100, 1, "@1", window_name="renamed")
+        mgr.update_user_window_offset(100, "@1", 6)
+        assert saves == [1, 1, 1, 1]
+
+    async def test_identical_content_not_rewritten(
+        self, mgr: SessionManager, saves: list[int]
+    ) -> None:
+        mgr.update_user_window_offset(100, "@1", 5)
+        await mgr.flush()
+        mgr.update_user_window_offset(100, "@1", 6)
+        mgr.update_user_window_offset(100, "@1", 5)
+        await mgr.flush()
+        assert saves == [1]
+        mgr.update_user_window_offset(100, "@1", 7)
+        await mgr.flush()
+        assert saves == [1, 1]
+
+    async def test_flush_writes_pending_state(
+        self, mgr: SessionManager, saves: list[int]
+    ) -> None:
+        mgr.set_group_chat_id(100, 1, -111)
+        await mgr.flush()
+        assert saves == [1]
+        await mgr.flush()
+        assert saves == [1]
+
+    async def test_failed_write_retried_on_flush(
+        self, mgr: SessionManager, monkeypatch
+    ) -> None:
+        written: list[bytes] = []
+
+        def write_state(self, content: bytes) -> None:
+            if not written:
+                written.append(b"")
+                raise OSError("disk full")
+            written.append(content)
+
+        monkeypatch.setattr(SessionManager, "_write_state", write_state)
+        mgr._flush_delay = 0.01
+        mgr.set_group_chat_id(100, 1, -111)
+        await asyncio.sleep(0.05)
+        assert written == [b""]
+
+        await mgr.flush()
+        assert len(written) == 2
+        assert json.loads(written[1])["group_chat_ids"] == {"100:1": -111}
+
+    def test_only_changed_sections_reencoded(self, mgr: SessionManager) -> None:
+        mgr.bind_thread(100, 1, "@1", window_name="proj")
+        mgr._encode_state(mgr._snapshot_sections())
+        first = dict(mgr._state_sections)
+        mgr.update_user_window_offset(100, "@1", 5)
+        state = json.loads(mgr._encode_state(mgr._snapshot_sections()))
+        second = mgr._state_sections
+        assert second["thread_bindings"] is first["thread_bindings"]
+        assert second["window_display_names"] is first["window_display_names"]
+        assert second["user_window_offsets"] is not first["user_window_offsets"]
+        assert state["user_window_offsets"] == {"100": {"@1": 5}}
+
+    def test_encoding_matches_whole_dict_dump(self, mgr: SessionManager) -> None:
+        mgr.window_states["@1"] = WindowState(session_id="a", cwd="/p")
+        mgr.bind_thread(100, 1, "@1", window_name="项目")
+        mgr.update_user_window_offset(100, "@1", 5)
+        mgr.set_group_chat_id(100, 1, -111)
+        content = mgr._encode_state(mgr._snapshot_sections())
+        expected = orjson.dumps(json.loads(content), option=orjson.OPT_INDENT_2)
+        assert content == expected
+        assert list(json.loads(content)) == list(session_module._STATE_SECTIONS)
+
+    def test_empty_state_encodes(self, mgr: SessionManager) -> None:
+        state = json.loads(mgr._encode_state(mgr._snapshot_sections()))
+        assert state == {name: {} for name in session_module._STATE_SECTIONS}
+
+    async def test_snapshot_isolated_from_later_changes(
+        self, mgr: SessionManager
+    ) -> None:
+        mgr.bind_thread(100, 1, "@1", window_name="proj")
+        sections = mgr._snapshot_sections()
+        mgr.bind_thread(100, 2, "@2", window_name="other")
+        state = json.loads(mgr._encode_state(sections))
+        assert state["thread_bindings"] == {"100": {"1": "@1"}}
+        assert state["window_display_names"] == {"@1": "proj"}
+        await mgr.flush()
+
+    async def test_write_uses_snapshot(self, mgr: SessionManager, monkeypatch) -> None:
+        written: list[bytes] = []
+        monkeypatch.setattr(
+            SessionManager,
+            "_write_state",
+            lambda self, content: written.append(content),
+        )
+        mgr.update_user_window_offset(100, "@1", 10)
+        await mgr.flush()
+        mgr.update_user_window_offset(100, "@1", 20)
+        assert json.loads(written[0])["user_window_offsets"] == {"100": {"@1": 10}}
+        await mgr.flush()
+        assert json.loads(written[1])["user_window_offsets"] == {"100": {"@1": 20}}
+
+
+class TestSessionMapCache:
+    @pytest.fixture
+    def map_file(self, tmp_path: Path, monkeypatch) -> Path:
+        path = tmp_path / "session_map.json"
+        monkeypatch.setattr(config, "session_map_file", path)
+        return path
+
+    def _write(self, path: Path, session_map: dict) -> None:
+        path.write_text(json.dumps(session_map))
+
+    async def test_missing_file_returns_none(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        assert await mgr._read_session_map() is None
+
+    async def test_unchanged_file_served_from_cache(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        self._write(map_file, {"ccbot:@1": {"session_id": "a"}})
+        first = await mgr._read_session_map()
+        assert first is await mgr._read_session_map()
+
+    async def test_changed_file_reread(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        self._write(map_file, {"ccbot:@1": {"session_id": "a"}})
+        await mgr._read_session_map()
+        self._write(map_file, {"ccbot:@1": {"session_id": "bb"}})
+        session_map = await mgr._read_session_map()
+        assert session_map == {"ccbot:@1": {"session_id": "bb"}}
+
+    async def test_load_session_map_updates_window_states(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        key = f"{config.tmux_session_name}:@1"
+        self._write(map_file, {key: {"session_id": "abc", "cwd": "/tmp/p"}})
+        await mgr.load_session_map()
+        assert mgr.get_window_state("@1").session_id == "abc"
+        await mgr.flush()
+
+    async def test_wait_for_entry_wakes_before_interval(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        key = f"{config.tmux_session_name}:@1"
+
+        async def write_later() -> None:
+            await asyncio.sleep(0.05)
+            self._write(map_file, {key: {"session_id": "abc", "cwd": "/tmp/p"}})
+
+        writer = asyncio.create_task(write_later())
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        found = await mgr.wait_for_session_map_entry("@1", timeout=5, interval=2)
+        await writer
+        assert found
+        assert loop.time() - start < 1
+        await mgr.flush()
+
+    async def test_wait_for_entry_times_out(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        found = await mgr.wait_for_session_map_entry("@1", timeout=0.1, interval=0.02)
+        assert not found
+
+    async def test_wait_for_entry_does_not_overrun_timeout(
+        self, mgr: SessionManager, map_file: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(session_module, "_MIN_POLL_INTERVAL", 2.0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        found = await mgr.wait_for_session_map_entry("@1", timeout=0.1, interval=5)
+        assert not found
+        assert loop.time() - start < 1
+
+    async def test_unchanged_map_not_reapplied(
+        self, mgr: SessionManager, map_file: Path, monkeypatch
+    ) -> None:
+        key = f"{config.tmux_session_name}:@1"
+        self._write(map_file, {key: {"session_id": "abc", "cwd": "/tmp/p"}})
+        await mgr.load_session_map()
+        calls: list[str] = []
+        monkeypatch.setattr(mgr, "get_window_state", lambda wid: calls.append(wid))
+        await mgr.load_session_map()
+        assert calls == []
+        await mgr.flush()
+
+    async def test_local_change_reapplies_map(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        key = f"{config.tmux_session_name}:@1"
+        self._write(map_file, {key: {"session_id": "abc", "cwd": "/tmp/p"}})
+        await mgr.load_session_map()
+        mgr.clear_window_session("@1")
+        mgr.get_window_state("@2")
+        await mgr.load_session_map()
+        assert mgr.get_window_state("@1").session_id == "abc"
+        assert "@2" not in mgr.window_states
+        await mgr.flush()
+
+    async def test_load_session_map_skips_foreign_keys(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        name = config.tmux_session_name
+        info = {"session_id": "abc", "cwd": "/tmp/p"}
+        self._write(
+            map_file,
+            {
+                f"{name}:@1": info,
+                f"{name}:legacy": info,
+                f"{name}:@2x": info,
+                f"other-{name}:@3": info,
+            },
+        )
+        await mgr.load_session_map()
+        assert set(mgr.window_states) == {"@1"}
+        await mgr.flush()
+
+    async def test_cleanup_stale_and_old_format_entries(
+        self, mgr: SessionManager, map_file: Path
+    ) -> None:
+        name = config.tmux_session_name
+        self._write(
+            map_file,
+            {f"{name}:@1": {}, f"{name}:@2": {}, f"{name}:legacy": {}, "other:@2": {}},
+        )
+        await mgr._cleanup_session_map({"@1"})
+        assert json.loads(map_file.read_text()) == {
+            f"{name}:@1": {},
+            "other:@2": {},
+        }
+
+
+class TestFindUsersForSession:
+    def _assign(self, mgr: SessionManager, window_id: str, sid: str) -> None:
+        state = mgr.get_window_state(window_id)
+        mgr._set_window_session(window_id, state, sid)
+        state.cwd = "/tmp/p"
+
+    async def test_finds_bound_threads(self, mgr: SessionManager) -> None:
+        self._assign(mgr, "@1", "sid-a")
+        self._assign(mgr, "@2", "sid-b")
+        mgr.bind_thread(100, 1, "@1")
+        mgr.bind_thread(200, 7, "@1")
+        mgr.bind_thread(100, 2, "@2")
+        result = await mgr.find_users_for_session("sid-a")
+        assert sorted(result) == [(100, "@1", 1), (200, "@1", 7)]
+        await mgr.flush()
+
+    async def test_rebind_and_unbind_update_index(self, mgr: SessionManager) -> None:
+        self._assign(mgr, "@1", "sid-a")
+        mgr.bind_thread(100, 1, "@1")
+        mgr.bind_thread(100, 1, "@2")
+        assert await mgr.find_users_for_session("sid-a") == []
+        mgr.bind_thread(100, 1, "@1")
+        mgr.unbind_thread(100, 1)
+        assert await mgr.find_users_for_session("sid-a") == []
+        await mgr.flush()
+
+    async def test_session_change_moves_window(self, mgr: SessionManager) -> None:
+        self._assign(mgr, "@1", "sid-a")
+        mgr.bind_thread(100, 1, "@1")
+        self._assign(mgr, "@1", "sid-b")
+        assert await mgr.find_users_for_session("sid-a") == []
+        assert await mgr.find_users_for_session("sid-b") == [(100, "@1", 1)]
+        mgr.clear_window_session("@1")
+        assert await mgr.find_users_for_session("sid-b") == []
+        await mgr.flush()
+
+
+class TestSessionFiles:
+    CWD = "/data/proj"
+
+    @pytest.fixture
+    def transcript(self, tmp_path: Path, monkeypatch) -> Path:
+        monkeypatch.setattr(config, "claude_projects_path", tmp_path)
+        path = tmp_path / "-data-proj" / "sid.jsonl"
+        path.parent.mkdir()
+        path.write_text("")
+        return path
+
+    def _append(self, path: Path, *entries: dict | str) -> None:
+        with path.open("a") as f:
+            for e in entries:
+                f.write((e if isinstance(e, str) else json.dumps(e)) + "\n")
+
+    def _user(self, text: str) -> dict:
+        return {"type": "user", "message": {"role": "user", "content": text}}
+
+    async def test_recent_messages_byte_range(
+        self, mgr: SessionManager, transcript: Path
+    ) -> None:
+        self._append(transcript, self._user("one"))
+        start = transcript.stat().st_size
+        self._append(transcript, self._user("two"), "garbage")
+        end = transcript.stat().st_size
+        self._append(transcript, self._user("three"))
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+
+        messages, total = await mgr.get_recent_messages("@1")
+        assert [m.text for m in messages] == ["one", "two", "three"]
+        assert total == 3
+        messages, _ = await mgr.get_recent_messages(
+            "@1", start_byte=start, end_byte=end
+        )
+        assert [m.text for m in messages] == ["two"]
+
+    def test_session_file_path_cached_per_projects_dir(
+        self, mgr: SessionManager, transcript: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        path = mgr._build_session_file_path("sid", self.CWD)
+        assert path == tmp_path / "-data-proj" / "sid.jsonl"
+        assert mgr._build_session_file_path("sid", self.CWD) is path
+        monkeypatch.setattr(config, "claude_projects_path", tmp_path / "other")
+        moved = mgr._build_session_file_path("sid", self.CWD)
+        assert moved == tmp_path / "other" / "-data-proj" / "sid.jsonl"
+        assert mgr._build_session_file_path("", self.CWD) is None
+
+    async def test_session_file_resolved_without_reading(
+        self, mgr: SessionManager, transcript: Path
+    ) -> None:
+        self._append(transcript, self._user("one"))
+        assert await mgr.resolve_session_file("@1") is None
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+        assert await mgr.resolve_session_file("@1") == transcript
+        state.cwd = "/elsewhere"
+        assert await mgr.resolve_session_file("@1") == transcript
+        found = await mgr.stat_session_file("@1")
+        assert found is not None
+        assert found[0] == transcript
+        assert found[1].st_size == transcript.stat().st_size
+
+    async def test_recent_messages_tail_limit(
+        self, mgr: SessionManager, transcript: Path, monkeypatch
+    ) -> None:
+        self._append(transcript, self._user("one"), self._user("two"))
+        line = json.dumps(self._user("three")) + "\n"
+        self._append(transcript, self._user("three"))
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+
+        monkeypatch.setattr(config, "recent_messages_tail_bytes", len(line))
+        messages, _ = await mgr.get_recent_messages("@1")
+        assert [m.text for m in messages] == ["three"]
+        monkeypatch.setattr(config, "recent_messages_tail_bytes", len(line) + 5)
+        messages, _ = await mgr.get_recent_messages("@1")
+        assert [m.text for m in messages] == ["three"]
+        messages, _ = await mgr.get_recent_messages("@1", start_byte=1)
+        assert [m.text for m in messages] == ["two", "three"]
+
+    async def test_recent_messages_cached_until_file_changes(
+        self, mgr: SessionManager, transcript: Path, monkeypatch
+    ) -> None:
+        self._append(transcript, self._user("one"))
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+        reads: list[int] = []
+        real_read = session_module.read_file_range
+
+        def spy(path, start=0, end=None):
+            reads.append(start)
+            return real_read(path, start, end)
+
+        monkeypatch.setattr(session_module, "read_file_range", spy)
+        first, _ = await mgr.get_recent_messages("@1")
+        first.clear()  # callers get their own list
+        messages, total = await mgr.get_recent_messages("@1")
+        assert [m.text for m in messages] == ["one"] and total == 1
+        assert len(reads) == 1
+
+        self._append(transcript, self._user("two"))
+        messages, _ = await mgr.get_recent_messages("@1")
+        assert [m.text for m in messages] == ["one", "two"]
+        assert len(reads) == 2
+
+        monkeypatch.setattr(session_module, "_RECENT_MESSAGES_CACHE_SIZE", 2)
+        for start in (1, 2, 3):
+            await mgr.get_recent_messages("@1", start_byte=start)
+        assert len(mgr._recent_messages) == 2
+
+    async def test_recent_messages_parsed_incrementally(
+        self, mgr: SessionManager, transcript: Path, monkeypatch
+    ) -> None:
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+        tool_use = {
+            "type": "assistant",
+            "message": {
+                "content": [
+                    {"type": "tool_use", "id": "t1", "name": "Bash", "input": {}}
+                ]
+            },
+        }
+        tool_result = {
+            "type": "user",
+            "message": {
+                "content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": "done"}
+                ]
+            },
+        }
+        lines = [
+            self._user("hi"),
+            tool_use,
+            self._user("<command-name>/model</command-name>"),
+            {"type": "summary", "summary": "S"},
+            self._user("<local-command-stdout>ok</local-command-stdout>"),
+            tool_result,
+        ]
+        starts: list[int] = []
+        real_read = session_module.read_file_range
+
+        def spy(path, start=0, end=None):
+            starts.append(start)
+            return real_read(path, start, end)
+
+        monkeypatch.setattr(session_module, "read_file_range", spy)
+        for line in lines:
+            before = transcript.stat().st_size
+            self._append(transcript, line)
+            messages, _ = await mgr.get_recent_messages("@1")
+            assert starts[-1] == before
+            parsed, _ = TranscriptParser.parse_entries(
+                mgr._decode_entries(transcript.read_bytes())
+            )
+            assert messages == session_module._history_messages(parsed)
+
+        # An unterminated last line is shown but parsed again next time
+        complete = transcript.stat().st_size
+        with transcript.open("a") as f:
+            f.write(json.dumps(self._user("partial")))
+        messages, _ = await mgr.get_recent_messages("@1")
+        assert messages[-1].text == "partial"
+        assert mgr._message_logs[str(transcript)].offset == complete
+
+    async def test_recent_messages_parsed_off_event_loop(
+        self, mgr: SessionManager, transcript: Path, monkeypatch
+    ) -> None:
+        self._append(transcript, self._user("one"))
+        state = mgr.get_window_state("@1")
+        state.session_id, state.cwd = "sid", self.CWD
+        threads: list[threading.Thread] = []
+        real_parse = TranscriptParser.parse_entries
+
+        def spy(entries, pending_tools=None):
+            threads.append(threading.current_thread())
+            return real_parse(entries, pending_tools)
+
+        monkeypatch.setattr(TranscriptParser, "parse_entries", spy)
+        await mgr.get_recent_messages("@1")
+        await mgr.get_recent_messages("@1", start_byte=1)
+        assert threads
+        assert threading.main_thread() not in threads
+
+    async def test_session_found_outside_cwd_project(
+        self, mgr: SessionManager, transcript: Path
+    ) -> None:
+        self._append(transcript, self._user("moved"))
+        found = await mgr._stat_session("sid", "/some/other/cwd")
+        assert found is not None
+        assert found[0] == transcript
+        assert await mgr._stat_session("missing", self.CWD) is None
+
+    def test_find_session_file_caches_hits_and_project_dirs(
+        self, mgr: SessionManager, transcript: Path
+    ) -> None:
+        assert mgr._find_session_file("sid") == transcript
+        assert mgr._found_session_files == {"sid": transcript}
+        # A transcript added to a known project dir is still found
+        (transcript.parent / "new.jsonl").write_text("")
+        assert mgr._find_session_file("new") == transcript.parent / "new.jsonl"
+        # A new project dir changes the projects mtime and is re-listed
+        other = transcript.parent.parent / "-other"
+        other.mkdir()
+        (other / "late.jsonl").write_text("")
+        assert mgr._find_session_file("late") == other / "late.jsonl"
+        # A moved transcript drops the stale hit and is found again
+        transcript.rename(other / "sid.jsonl")
+        assert mgr._find_session_file("sid") == other / "sid.jsonl"
+        assert mgr._find_session_file("missing") is None
+
+
+class TestResolveStaleIds:
+    @pytest.fixture
+    def live(self, monkeypatch) -> list[SimpleNamespace]:
+        windows: list[SimpleNamespace] = []
+
+        async def list_windows() -> list[SimpleNamespace]:
+            return windows
+
+        monkeypatch.setattr(tmux_manager, "list_windows", list_windows)
+        return windows
+
+    async def test_remaps_all_containers_consistently(
+        self, mgr: SessionManager, live: list[SimpleNamespace]
+    ) -> None:
+        live += [
+            SimpleNamespace(window_id="@7", window_name="proj"),
+            SimpleNamespace(window_id="@8", window_name="legacy"),
+        ]
+        mgr.window_states = {
+            "@5": WindowState(session_id="a", cwd="/p"),
+            "legacy": WindowState(session_id="b", cwd="/l"),
+            "@9": WindowState(session_id="c", cwd="/g"),
+        }
+        mgr.window_display_names = {"@5": "proj"}
+        mgr.thread_bindings = {
+            (100, 1): "@5",
+            (100, 2): "legacy",
+            (100, 3): "@9",
+            (200, 4): "@9",
+        }
+        mgr.user_window_offsets = {(100, "@5"): 10, (100, "@9"): 20}
+        mgr._rebuild_indexes()
+
+        await mgr.resolve_stale_ids()
+
+        assert set(mgr.window_states) == {"@7", "@8"}
+        assert mgr.window_states["@7"].window_name == "proj"
+        assert mgr.window_states["@8"].window_name == "legacy"
+        assert mgr.thread_bindings == {(100, 1): "@7", (100, 2): "@8"}
+        assert mgr.user_window_offsets == {(100, "@7"): 10}
+        assert mgr.window_display_names == {"@7": "proj", "@8": "legacy"}
+        assert await mgr.find_users_for_session("a") == [(100, "@7", 1)]
+        await mgr.flush()
+
+    async def test_all_live_ids_left_untouched(
+        self, mgr: SessionManager, live: list[SimpleNamespace]
+    ) -> None:
+        live.append(SimpleNamespace(window_id="@1", window_name="proj"))
+        mgr.window_states = {"@1": WindowState(session_id="a", cwd="/p")}
+        mgr.thread_bindings = {(100, 1): "@1"}
+        bindings = mgr.thread_bindings
+        states = mgr.window_states
+
+        await mgr.resolve_stale_ids()
+
+        assert mgr.thread_bindings is bindings
+        assert mgr.window_states is states
+        assert not mgr._dirty
+
+    async def test_stale_offset_alone_triggers_migration(
+        self, mgr: SessionManager, live: list[SimpleNamespace]
+    ) -> None:
+        live.append(SimpleNamespace(window_id="@1", window_name="proj"))
+        mgr.thread_bindings = {(100, 1): "@1"}
+        mgr.user_window_offsets = {(100, "@1"): 5, (100, "@2"): 9}
+
+        await mgr.resolve_stale_ids()
+
+        assert mgr.user_window_offsets == {(100, "@1"): 5}
+        await mgr.flush()
+
+    async def test_session_map_cleaned_when_all_ids_live(
+        self,
+        mgr: SessionManager,
+        live: list[SimpleNamespace],
+        tmp_path: Path,
+        monkeypatch,
+    ) -> None:
+        map_file = tmp_path / "session_map.json"
+        monkeypatch.setattr(config, "session_map_file", map_file)
+        name = config.tmux_session_name
+        map_file.write_text(json.dumps({f"{name}:@1": {}, f"{name}:@2": {}}))
+        live.append(SimpleNamespace(window_id="@1", window_name="proj"))
+        mgr.thread_bindings = {(100, 1): "@1"}
+
+        await mgr.resolve_stale_ids()
+
+        assert json.loads(map_file.read_text()) == {f"{name}:@1": {}}
+
+    async def test_indexes_match_full_rebuild(
+        self, mgr: SessionManager, live: list[SimpleNamespace]
+    ) -> None:
+        live.append(SimpleNamespace(window_id="@7", window_name="proj"))
+        mgr.window_states = {
+            "@1": WindowState(session_id="a", cwd="/p", window_name="proj"),
+            "@2": WindowState(session_id="b", cwd="/q", window_name="gone"),
+        }
+        mgr.thread_bindings = {(100, 1): "@1", (100, 2): "@2"}
+        mgr._rebuild_indexes()
+
+        await mgr.resolve_stale_ids()
+
+        sid_index = {k: v for k, v in mgr._sid_to_windows.items() if v}
+        window_threads = {k: v for k, v in mgr._window_threads.items() if v}
+        mgr._rebuild_indexes()
+        assert sid_index == mgr._sid_to_windows
+        assert window_threads == mgr._window_threads
+        assert await mgr.find_users_for_session("a") == [(100, "@7", 1)]
+        await mgr.flush()
@@ -1,11 +1,17 @@
-"""Unit tests for SessionMonitor JSONL reading and offset handling."""
+"""Unit tests for SessionMonitor project scanning, JSONL reading and offsets."""
 
+import asyncio
 import json
+from pathlib import PosixPath
+from types import SimpleNamespace
 
 import pytest
 
+from ccbot import session_monitor
+from ccbot.config import config
 from ccbot.monitor_state import TrackedSession
-from ccbot.session_monitor import SessionMonitor
+from ccbot.session_monitor import SessionInfo, SessionMonitor
+from ccbot.tmux_manager import tmux_manager
 
 
 class TestReadNewLinesOffsetRecovery:
@@ -93,3 +99,297 @@ class TestReadNewLinesOffsetRecovery:
         # Should reset offset to 0 and read the line
         assert session.last_byte_offset == jsonl_file.stat().st_size
         assert len(result) == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_line_retried_next_cycle(
+        self, monitor, tmp_path, make_jsonl_entry
+    ):
+        """A half-written last line is left for the next read."""
+        jsonl_file = tmp_path / "session.jsonl"
+        line1 = json.dumps(
+            make_jsonl_entry(msg_type="assistant", content="ünï"), ensure_ascii=False
+        )
+        line2 = json.dumps(
+            make_jsonl_entry(msg_type="assistant", content="二"), ensure_ascii=False
+        )
+        jsonl_file.write_text(line1 + "\n" + line2[:10], encoding="utf-8")
+        session = TrackedSession(
+            session_id="test-session",
+            file_path=str(jsonl_file),
+            last_byte_offset=0,
+        )
+
+        assert len(await monitor._read_new_lines(session, jsonl_file)) == 1
+        assert session.last_byte_offset == len(line1.encode()) + 1
+
+        jsonl_file.write_text(line1 + "\n" + line2 + "\n", encoding="utf-8")
+        result = await monitor._read_new_lines(session, jsonl_file)
+        assert [e["message"]["content"] for e in result] == ["二"]
+        assert session.last_byte_offset == jsonl_file.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_corrupt_complete_line_skipped(
+        self, monitor, tmp_path, make_jsonl_entry
+    ):
+        """A newline-terminated line that does not parse does not stall reads."""
+        jsonl_file = tmp_path / "session.jsonl"
+        line1 = json.dumps(make_jsonl_entry(msg_type="assistant", content="a"))
+        line2 = json.dumps(make_jsonl_entry(msg_type="assistant", content="b"))
+        jsonl_file.write_text(line1 + "\n{garbage\n" + line2 + "\n", encoding="utf-8")
+        session = TrackedSession(
+            session_id="test-session",
+            file_path=str(jsonl_file),
+            last_byte_offset=0,
+        )
+
+        result = await monitor._read_new_lines(session, jsonl_file)
+
+        assert [e["message"]["content"] for e in result] == ["a", "b"]
+        assert session.last_byte_offset == jsonl_file.stat().st_size
+
+
+class TestScanProjects:
+    """Tests for scan_projects path matching."""
+
+    @pytest.mark.asyncio
+    async def test_shared_project_path_resolved_once(self, tmp_path, monkeypatch):
+        work = tmp_path / "work"
+        work.mkdir()
+        project_dir = tmp_path / "projects" / "-work"
+        project_dir.mkdir(parents=True)
+        entries = []
+        for sid in ("s1", "s2", "s3"):
+            jsonl = project_dir / f"{sid}.jsonl"
+            jsonl.write_text("")
+            entries.append(
+                {"sessionId": sid, "fullPath": str(jsonl), "projectPath": str(work)}
+            )
+        (project_dir / "sessions-index.json").write_text(
+            json.dumps({"originalPath": str(work), "entries": entries})
+        )
+
+        async def list_windows():
+            return [SimpleNamespace(cwd=str(work))]
+
+        monkeypatch.setattr(tmux_manager, "list_windows", list_windows)
+        resolved: list[str] = []
+        real_resolve = PosixPath.resolve
+
+        def counting_resolve(self, strict=False):
+            resolved.append(str(self))
+            return real_resolve(self, strict)
+
+        monkeypatch.setattr(PosixPath, "resolve", counting_resolve)
+
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "projects",
+            state_file=tmp_path / "monitor_state.json",
+        )
+        sessions = await monitor.scan_projects()
+
+        assert sorted(s.session_id for s in sessions) == ["s1", "s2", "s3"]
+        assert resolved == [str(work)]
+
+        # Later polls reuse the resolved path until the session_map changes
+        await monitor.scan_projects()
+        assert resolved == [str(work)]
+        monkeypatch.setattr(config, "session_map_file", tmp_path / "map.json")
+        await monitor._detect_and_cleanup_changes()
+        await monitor.scan_projects()
+        assert resolved == [str(work), str(work)]
+
+    def test_resolve_cache_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(session_monitor, "_RESOLVE_CACHE_SIZE", 2)
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "projects",
+            state_file=tmp_path / "monitor_state.json",
+        )
+        for name in ("a", "b", "c"):
+            monitor._normalize_path(str(tmp_path / name))
+        assert list(monitor._resolve_cache) == [
+            str(tmp_path / "b"),
+            str(tmp_path / "c"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_scan_carries_stat_and_skips_missing(self, tmp_path, monkeypatch):
+        work = tmp_path / "work"
+        work.mkdir()
+        project_dir = tmp_path / "projects" / "-work"
+        project_dir.mkdir(parents=True)
+        (project_dir / "indexed.jsonl").write_text("{}\n")
+        (project_dir / "loose.jsonl").write_text("{}\n{}\n")
+        (project_dir / "notes.txt").write_text("")
+        entries = [
+            {"sessionId": sid, "fullPath": str(project_dir / f"{sid}.jsonl")}
+            for sid in ("indexed", "gone")
+        ]
+        (project_dir / "sessions-index.json").write_text(
+            json.dumps({"originalPath": str(work), "entries": entries})
+        )
+
+        async def list_windows():
+            return [SimpleNamespace(cwd=str(work))]
+
+        monkeypatch.setattr(tmux_manager, "list_windows", list_windows)
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "projects",
+            state_file=tmp_path / "monitor_state.json",
+        )
+        sessions = {s.session_id: s for s in await monitor.scan_projects()}
+
+        assert sorted(sessions) == ["indexed", "loose"]
+        for sid, info in sessions.items():
+            assert info.file_path == project_dir / f"{sid}.jsonl"
+            assert info.stat is not None
+            assert info.stat.st_size == info.file_path.stat().st_size
+
+    @pytest.mark.asyncio
+    async def test_missing_projects_path(self, tmp_path, monkeypatch):
+        async def list_windows():
+            return [SimpleNamespace(cwd=str(tmp_path))]
+
+        monkeypatch.setattr(tmux_manager, "list_windows", list_windows)
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "nope",
+            state_file=tmp_path / "monitor_state.json",
+        )
+        assert await monitor.scan_projects() == []
+
+
+class TestLoadCurrentSessionMap:
+    """Tests for _load_current_session_map caching."""
+
+    @pytest.fixture
+    def monitor(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "session_map_file", tmp_path / "session_map.json")
+        return SessionMonitor(
+            projects_path=tmp_path / "projects",
+            state_file=tmp_path / "monitor_state.json",
+        )
+
+    def _write(self, session_map: dict) -> None:
+        config.session_map_file.write_text(json.dumps(session_map))
+
+    @pytest.mark.asyncio
+    async def test_missing_file_returns_empty(self, monitor):
+        assert await monitor._load_current_session_map() == {}
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_returns_cached_mapping(self, monitor):
+        name = config.tmux_session_name
+        self._write(
+            {f"{name}:@1": {"session_id": "a"}, "other:@2": {"session_id": "b"}}
+        )
+        first = await monitor._load_current_session_map()
+        assert first == {"@1": "a"}
+        assert await monitor._load_current_session_map() is first
+
+        self._write(
+            {f"{name}:@1": {"session_id": "a"}, f"{name}:@3": {"session_id": "c"}}
+        )
+        assert await monitor._load_current_session_map() == {"@1": "a", "@3": "c"}
+
+
+class TestCheckForUpdates:
+    """Tests for check_for_updates fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_read_concurrently_in_scan_order(
+        self, tmp_path, monkeypatch, make_jsonl_entry
+    ):
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "projects",
+            state_file=tmp_path / "monitor_state.json",
+        )
+        infos = []
+        for sid in ("s1", "s2", "s3"):
+            path = tmp_path / f"{sid}.jsonl"
+            entry = make_jsonl_entry(msg_type="assistant", content=f"from {sid}")
+            path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+            monitor.state.update_session(
+                TrackedSession(session_id=sid, file_path=str(path))
+            )
+            infos.append(SessionInfo(session_id=sid, file_path=path))
+
+        async def scan_projects():
+            return infos + [infos[0]]
+
+        monkeypatch.setattr(monitor, "scan_projects", scan_projects)
+        in_flight = peak = 0
+        real_read = monitor._read_new_lines
+
+        async def read_new_lines(session, file_path):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await real_read(session, file_path)
+
+        monkeypatch.setattr(monitor, "_read_new_lines", read_new_lines)
+
+        messages = await monitor.check_for_updates({"s1", "s3"})
+
+        assert [m.text for m in messages] == ["from s1", "from s3"]
+        assert peak == 2
+
+
+class TestAdaptiveInterval:
+    """Tests for _update_interval."""
+
+    def test_speeds_up_on_activity_and_eases_back(self, tmp_path):
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "projects",
+            poll_interval=2.0,
+            state_file=tmp_path / "monitor_state.json",
+        )
+        assert monitor._update_interval(False) == 2.0
+        assert monitor._update_interval(True) == 0.5
+        assert monitor._update_interval(False) == 0.75
+        assert monitor._update_interval(False) == 1.125
+        assert monitor._update_interval(False) == 1.6875
+        assert monitor._update_interval(False) == 2.0
+        assert monitor._update_interval(False) == 2.0
+
+
+class TestWatchWake:
+    """Tests for the optional file-change wake-up."""
+
+    @pytest.mark.asyncio
+    async def test_transcript_change_wakes_sleep(self, tmp_path, monkeypatch):
+        seen_filters = []
+
+        async def fake_awatch(path, watch_filter):
+            seen_filters.append(watch_filter)
+            yield {("modified", str(path / "s.jsonl"))}
+
+        monkeypatch.setattr(session_monitor, "awatch", fake_awatch)
+        monitor = SessionMonitor(
+            projects_path=tmp_path,
+            poll_interval=60.0,
+            state_file=tmp_path / "monitor_state.json",
+        )
+        await monitor._watch_projects()
+        await asyncio.wait_for(monitor._sleep(), timeout=1.0)
+
+        assert not monitor._wake.is_set()
+        (watch_filter,) = seen_filters
+        assert watch_filter(None, "/p/-w/s.jsonl")
+        assert not watch_filter(None, "/p/-w/sessions-index.json")
+
+    @pytest.mark.asyncio
+    async def test_watch_error_falls_back_to_polling(self, tmp_path, monkeypatch):
+        async def fake_awatch(path, watch_filter):
+            raise FileNotFoundError(path)
+            yield
+
+        monkeypatch.setattr(session_monitor, "awatch", fake_awatch)
+        monitor = SessionMonitor(
+            projects_path=tmp_path / "missing",
+            poll_interval=0.01,
+            state_file=tmp_path / "monitor_state.json",
+        )
+        await monitor._watch_projects()
+        await monitor._sleep()
+        assert not monitor._wake.is_set()
@@ -19,13 +19,26 @@ class TestParseLine:
         "line, expected",
         [
             ('{"type": "user"}', {"type": "user"}),
+            (b'{"type": "user"}\n', {"type": "user"}),
             ("not-json", None),
+            (b'{"type": "us', None),
             ("", None),
             ("   \t  ", None),
+            (b"\r\n", None),
+            (b'  {"type": "user"} \r\n', {"type": "user"}),
+        ],
+        ids=[
+            "valid_json",
+            "bytes",
+            "invalid_json",
+            "partial_bytes",
+            "empty",
+            "whitespace",
+            "crlf_only",
+            "padded_bytes",
         ],
-        ids=["valid_json", "invalid_json", "empty", "whitespace"],
     )
-    def test_parse_line(self, line: str, expected: dict | None):
+    def test_parse_line(self, line: str | bytes, expected: dict | None):
         assert TranscriptParser.parse_line(line) == expected
 
 
@@ -1,11 +1,17 @@
-"""Tests for ccbot.utils: ccbot_dir, atomic_write_json, read_cwd_from_jsonl."""
+"""Tests for ccbot.utils: ccbot_dir, atomic writes, read_cwd_from_jsonl."""
 
 import json
 from pathlib import Path
 
 import pytest
 
-from ccbot.utils import atomic_write_json, ccbot_dir, read_cwd_from_jsonl
+from ccbot.utils import (
+    atomic_write_bytes,
+    atomic_write_json,
+    ccbot_dir,
+    read_cwd_from_jsonl,
+    read_file_range,
+)
 
 
 class TestCcbotDir:
@@ -37,6 +43,29 @@ class TestAtomicWriteJson:
         atomic_write_json(target, data)
         assert json.loads(target.read_text(encoding="utf-8")) == data
 
+    def test_non_ascii_written_as_utf8(self, tmp_path: Path):
+        target = tmp_path / "names.json"
+        atomic_write_json(target, {"window_name": "项目"})
+        assert "项目" in target.read_text(encoding="utf-8")
+        assert json.loads(target.read_bytes()) == {"window_name": "项目"}
+
+    def test_indent_zero_is_compact(self, tmp_path: Path):
+        target = tmp_path / "compact.json"
+        atomic_write_json(target, {"a": [1, 2]}, indent=0)
+        assert target.read_text(encoding="utf-8") == '{"a":[1,2]}'
+
+    def test_int_keys_written_as_strings(self, tmp_path: Path):
+        target = tmp_path / "ints.json"
+        atomic_write_json(target, {100: {1: "@1"}})
+        assert json.loads(target.read_text()) == {"100": {"1": "@1"}}
+
+    def test_write_bytes_replaces_file(self, tmp_path: Path):
+        target = tmp_path / "sub" / "raw.json"
+        atomic_write_bytes(target, b"old")
+        atomic_write_bytes(target, b"new")
+        assert target.read_bytes() == b"new"
+        assert [p.name for p in target.parent.iterdir()] == ["raw.json"]
+
     def test_no_temp_files_left_on_success(self, tmp_path: Path):
         target = tmp_path / "clean.json"
         atomic_write_json(target, {"ok": True})
@@ -44,6 +73,16 @@ class TestAtomicWriteJson:
         assert remaining == []
 
 
+class TestReadFileRange:
+    def test_reads_range_and_tail(self, tmp_path: Path):
+        f = tmp_path / "data.bin"
+        f.write_bytes(b"0123456789")
+        assert read_file_range(f) == b"0123456789"
+        assert read_file_range(f, 3) == b"3456789"
+        assert read_file_range(f, 3, 5) == b"34"
+        assert read_file_range(f, 5, 3) == b""
+
+
 class TestReadCwdFromJsonl:
     def test_cwd_in_first_entry(self, tmp_path: Path):
         f = tmp_path / "session.jsonl"